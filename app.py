@@ -1,20 +1,23 @@
 import pygame
 import sys
 import time
-import random
-import copy
 import json
 import os
 from enum import Enum
 import math
 
-# Initialize pygame
-pygame.init()
+from sudoku_core import (
+    Difficulty, GenerationMode, SolverStatus, STEP_UNDO,
+    IterativeSolver, PropagationSolver, DancingLinks, ConflictTracker,
+    SolverTrace, TracePlayer, PuzzleGenerator, PuzzlePool,
+    check_entries
+)
 
 # Constants
 WIDTH, HEIGHT = 600, 700
 BOARD_SIZE = 450
 GRID_SIZE = BOARD_SIZE // 9
+GRID_MARGIN = 2  # Thick grid lines reach this far outside their cell
 BUTTON_WIDTH, BUTTON_HEIGHT = 150, 50
 FONT_SIZE = 30
 SMALL_FONT_SIZE = 20
@@ -75,7 +78,20 @@ class Theme(Enum):
         "text": (100, 100, 100)
     }
 
-back=pygame.image.load('data/bg2.jpg')
+
+# The last solver trace is kept next to the saved game
+SAVED_TRACE_FILE = 'data/saved_trace.bin'
+
+# Solver visualization
+SOLVER_FPS = 60
+SOLVER_STEPS_PER_SECOND = 240
+SOLVER_TURBO_LEVELS = (1, 4, 16, 64, 256, 1024)  # Multipliers of the step rate
+
+# Longest the main loop sleeps waiting for events in idle rendering mode (milliseconds)
+IDLE_WAIT_TIMEOUT = 1000
+
+# Presses that follow a click sooner than this are treated as switch bounce (milliseconds)
+CLICK_DEBOUNCE = 80
 
 # Game state
 class GameState(Enum):
@@ -85,15 +101,13 @@ class GameState(Enum):
     HIGH_SCORES = 3
     QUIT_CONFIRM = 4
     ALGORITHM_SELECT = 5
-
-# Difficulty levels
-class Difficulty(Enum):
-    EASY = {"name": "Easy", "empty_cells": 30}
-    MEDIUM = {"name": "Medium", "empty_cells": 45}
-    HARD = {"name": "Hard", "empty_cells": 55}
+    REPLAY = 6
 
 class SudokuGame:
     def __init__(self):
+        # Initialize pygame
+        pygame.init()
+        
         # Set up the window
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Sudoku Game")
@@ -103,6 +117,21 @@ class SudokuGame:
         self.medium_font = pygame.font.SysFont('Arial', SMALL_FONT_SIZE)
         self.small_font = pygame.font.SysFont('Arial', 16)
         
+        # Board layers rendered once per theme, and what each cell looked like when last drawn
+        self.glyphs = {}
+        self.grid_layer = None
+        self.layers_theme = None
+        self.drawn_cells = [None] * 81
+        self.game_screen_valid = False
+        
+        # Pre-rendered screens and buttons, built on first use and rebuilt after a theme change
+        self.widgets = {}
+        
+        # Mouse input: the button a click started on, when the last click fired, volume dragging
+        self.pressed_button = None
+        self.last_click_time = -CLICK_DEBOUNCE
+        self.dragging_volume = False
+        
         # Game state
         self.current_state = GameState.WELCOME
         self.previous_state = None
@@ -114,12 +143,15 @@ class SudokuGame:
         self.original_board = [[0 for _ in range(9)] for _ in range(9)]
         self.solved_board = [[0 for _ in range(9)] for _ in range(9)]
         self.cell_status = [[0 for _ in range(9)] for _ in range(9)]  # 0: original, 1: user input, 2: hint
+        self.conflicts = ConflictTracker()
         
         # Game settings
         self.theme = Theme.CLASSIC
         self.current_colors = self.theme.value
         self.difficulty = Difficulty.MEDIUM
         self.sound_volume = 0.5
+        self.generation_mode = GenerationMode.SEARCH
+        self.idle_rendering = True  # Redraw only when something changed instead of every frame
         self.high_scores = []
         
         # Game stats
@@ -128,16 +160,44 @@ class SudokuGame:
         self.paused = False
         self.hints_used = 0
         self.algo_solve_time = 0
+        self.algo_search_time = None  # Time spent inside a visualized search, without the drawing
+        self.algo_stats = None  # SolverStats of the last solve
+        self.shown_seconds = None  # Whole seconds on the timer when it was last drawn
         
         # Solving visualization control
         self.stop_solving = False
         self.skip_to_solution = False
         self.visualize_solving = False
+        self.solver_turbo = 1
+        
+        # "Solve from here" starts the solvers from the player's correct entries
+        self.solve_from_here = False
+        self.solve_start = self.original_board
+        self.wrong_entries = []
+        
+        # Trace of the last visualized solve and its replay
+        self.record_trace = True
+        self.trace = None
+        self.replay = None
+        self.replay_playing = False
+        self.replay_direction = 1
+        self.replay_due = 0.0
+        self.replay_time = None
+        self.replay_saved = None
+        self.dragging_seek = False
         
         # Load game data if exists
         self.load_data()
         
+        # Puzzle generation runs in the background to keep NEW GAME instant. Generators keep
+        # their working board on self, so the refill thread gets its own and the UI thread
+        # only uses self.generator when the pool has run dry
+        self.generator = PuzzleGenerator(self.generation_mode)
+        self.puzzle_pool = PuzzlePool(PuzzleGenerator(self.generation_mode))
+        self.puzzle_pool.start()
+        
 
+        self.background_image = pygame.image.load('data/bg2.jpg')
         self.logo = pygame.image.load("data/lg2.jpg")  # Replace with your image path
         original_width, original_height = self.logo.get_size()
 
@@ -205,6 +265,8 @@ class SudokuGame:
                     self.current_colors = self.theme.value
                     self.difficulty = Difficulty[settings.get('difficulty', 'MEDIUM')]
                     self.sound_volume = settings.get('sound_volume', 0.5)
+                    self.generation_mode = GenerationMode[settings.get('generation_mode', 'SEARCH')]
+                    self.idle_rendering = settings.get('idle_rendering', True)
         except:
             pass
             
@@ -227,9 +289,14 @@ class SudokuGame:
             settings = {
                 'theme': self.theme.name,
                 'difficulty': self.difficulty.name,
-                'sound_volume': self.sound_volume
+                'sound_volume': self.sound_volume,
+                'generation_mode': self.generation_mode.name,
+                'idle_rendering': self.idle_rendering
             }
             json.dump(settings, f)
+        
+        # Save the ready puzzles
+        self.puzzle_pool.save()
     
     def save_game(self):
         # Save current game state
@@ -244,6 +311,12 @@ class SudokuGame:
                 'difficulty': self.difficulty.name
             }
             json.dump(saved_game, f)
+        
+        # Keep the solver trace with the saved game so it can be replayed after loading
+        if self.trace is not None:
+            self.trace.save(SAVED_TRACE_FILE)
+        elif os.path.exists(SAVED_TRACE_FILE):
+            os.remove(SAVED_TRACE_FILE)
         self.has_saved_game = True
         self.play_sound(self.success_sound)
     
@@ -254,38 +327,41 @@ class SudokuGame:
                 with open('data/saved_game.json', 'r') as f:
                     saved_game = json.load(f)
                     self.board = saved_game['board']
+                    self.conflicts.load(self.board)
                     self.original_board = saved_game['original_board']
                     self.solved_board = saved_game['solved_board']
                     self.cell_status = saved_game['cell_status']
                     self.elapsed_time = saved_game['elapsed_time']
                     self.hints_used = saved_game['hints_used']
                     self.difficulty = Difficulty[saved_game['difficulty']]
+                    self.trace = self.load_trace()
                     self.start_time = time.time()
                     self.paused = False
                     self.current_state = GameState.NEW_GAME
         except:
             self.new_game()
     
+    def load_trace(self):
+        # Load the saved solver trace if it belongs to the current puzzle
+        try:
+            trace = SolverTrace.load(SAVED_TRACE_FILE)
+        except (OSError, ValueError):
+            return None
+        return trace if trace.matches(self.original_board) else None
+    
     def play_sound(self, sound):
         # Play sound effect with current volume
         sound.set_volume(self.sound_volume)
         sound.play()
     
     def generate_board(self):
-        # Reset the board
-        self.board = [[0 for _ in range(9)] for _ in range(9)]
-        
-        # Generate a solved board
-        self.solve_empty_board()
-        
-        # Store the solved board
-        self.solved_board = copy.deepcopy(self.board)
-        
-        # Remove cells based on difficulty
-        self.remove_cells(self.difficulty.value["empty_cells"])
-        
-        # Store the original board
-        self.original_board = copy.deepcopy(self.board)
+        # Take a ready puzzle from the pool, generating one only if the pool has run dry
+        puzzle = self.puzzle_pool.pop(self.difficulty)
+        if puzzle is None:
+            puzzle = self.generator.generate(self.difficulty)
+        self.original_board, self.solved_board = puzzle
+        self.board = [row[:] for row in self.original_board]
+        self.conflicts.load(self.board)
         
         # Reset cell status
         self.cell_status = [[0 if self.board[i][j] != 0 else 1 for j in range(9)] for i in range(9)]
@@ -297,86 +373,6 @@ class SudokuGame:
         self.hints_used = 0
         self.marked_cells = set()
     
-    def solve_empty_board(self):
-        # Fill the diagonal boxes first (these can be filled independently)
-        for i in range(0, 9, 3):
-            self.fill_box(i, i)
-        
-        # Solve the rest of the board
-        self.solve_board()
-    
-    def fill_box(self, row, col):
-        # Fill a 3x3 box with random numbers
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        
-        index = 0
-        for i in range(3):
-            for j in range(3):
-                self.board[row + i][col + j] = nums[index]
-                index += 1
-    
-    def solve_board(self):
-        # Solve the board using backtracking
-        empty = self.find_empty()
-        if not empty:
-            return True
-        
-        row, col = empty
-        
-        # Shuffle numbers for more randomness
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        
-        for num in nums:
-            if self.is_valid(row, col, num):
-                self.board[row][col] = num
-                
-                if self.solve_board():
-                    return True
-                
-                # If placing the number didn't lead to a solution, backtrack
-                self.board[row][col] = 0
-        
-        return False
-    
-    def find_empty(self):
-        # Find an empty cell in the board
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return None
-    
-    def is_valid(self, row, col, num):
-        # Check if placing 'num' at position (row, col) is valid
-        # Check row
-        for j in range(9):
-            if self.board[row][j] == num:
-                return False
-        
-        # Check column
-        for i in range(9):
-            if self.board[i][col] == num:
-                return False
-        
-        # Check 3x3 box
-        box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if self.board[i][j] == num:
-                    return False
-        
-        return True
-    
-    def remove_cells(self, count):
-        # Remove 'count' cells from the board
-        cells = [(i, j) for i in range(9) for j in range(9)]
-        random.shuffle(cells)
-        
-        for i, j in cells[:count]:
-            self.board[i][j] = 0
-    
     def new_game(self):
         # Generate a new game board
         self.generate_board()
@@ -386,50 +382,58 @@ class SudokuGame:
         if os.path.exists('data/saved_game.json'):
             os.remove('data/saved_game.json')
             self.has_saved_game = False
+        if os.path.exists(SAVED_TRACE_FILE):
+            os.remove(SAVED_TRACE_FILE)
+        
+        # A trace only replays the puzzle it was recorded on
+        self.trace = None
     
     def draw_welcome_screen(self):
-        # Clear the screen
-        self.screen.fill(self.current_colors["bg"])
-        self.screen.blit(back,(0,0))
+        widgets = self.get_widgets(GameState.WELCOME)
+        self.algo_solve_time = 0
+        
+        # CONTINUE only works when there is a saved game
+        widgets["continue"]["action"] = self.load_game if self.has_saved_game else None
+        
+        # Draw the background and buttons
+        self.draw_widgets(widgets)
+    
+    def build_welcome_widgets(self):
+        # Clear the background
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(self.current_colors["bg"])
+        background.blit(self.background_image,(0,0))
         # Draw logo (could be replaced with an image)
         # logo_text = self.large_font.render("SUDOKU", True, self.current_colors["text"])
         logo_rect = self.logo.get_rect(center=(WIDTH//2, HEIGHT//4))
-        self.screen.blit(self.logo, logo_rect)
-        self.algo_solve_time = 0
-        # Draw buttons
+        background.blit(self.logo, logo_rect)
+        # Create buttons
         buttons = []
         buttons.append(self.create_button("NEW GAME", WIDTH // 2, HEIGHT // 2 - 60, self.start_new_game))
-
-        if self.has_saved_game:
-            buttons.append(self.create_button("CONTINUE", WIDTH // 2, HEIGHT // 2, self.load_game))
-        else:
-            # Create a disabled button
-            disabled_button = self.create_button("CONTINUE", WIDTH // 2, HEIGHT // 2, None)
-            buttons.append(disabled_button)
-
+        continue_button = self.create_button("CONTINUE", WIDTH // 2, HEIGHT // 2, None)
+        buttons.append(continue_button)
         buttons.append(self.create_button("SETTINGS", WIDTH // 2, HEIGHT // 2 + 60, self.open_settings))
         buttons.append(self.create_button("HIGH SCORES", WIDTH // 2, HEIGHT // 2 + 120, self.open_high_scores))
         buttons.append(self.create_button("QUIT", WIDTH // 2, HEIGHT // 2 + 180, self.confirm_quit))
-
-        # Handle button events and draw them
-        for button in buttons:
-            self.handle_button(button)
-            self.draw_button(button)
+        
+        return {"background": background, "buttons": buttons, "continue": continue_button}
     
     def draw_board(self):
-        # Calculate the offset to center the board
+        # Draw the cells whose number, color, selection or mark changed since they were
+        # last drawn, and return the screen rectangles that need updating
         offset_x = (WIDTH - BOARD_SIZE) // 2
         offset_y = (HEIGHT - BOARD_SIZE) // 2 - 50  # Adjusted to make room for buttons
         
-        # Draw the background for the board
-        pygame.draw.rect(self.screen, LIGHT_GRAY, (offset_x, offset_y, BOARD_SIZE, BOARD_SIZE))
+        # Digit glyphs and the grid lines are rendered once per theme
+        if self.layers_theme != self.theme:
+            self.build_board_layers()
+            self.drawn_cells = [None] * 81
+        glyphs = self.glyphs
         
         # Draw the cells
+        dirty_rects = []
         for i in range(9):
             for j in range(9):
-                cell_x = offset_x + j * GRID_SIZE
-                cell_y = offset_y + i * GRID_SIZE
-                
                 # Determine cell color
                 cell_color = self.current_colors["bg"]
                 if (i, j) == self.active_cell:
@@ -437,12 +441,10 @@ class SudokuGame:
                 elif (i, j) in self.marked_cells:
                     cell_color = self.current_colors["highlight"]
                 
-                # Draw cell background
-                pygame.draw.rect(self.screen, cell_color, (cell_x, cell_y, GRID_SIZE, GRID_SIZE))
-                
-                # Draw number if cell is not empty
-                if self.board[i][j] != 0:
-                    # Determine number color based on cell status
+                # Determine number color based on cell status
+                num = self.board[i][j]
+                num_color = None
+                if num != 0:
                     if self.cell_status[i][j] == 0:  # Original
                         num_color = self.current_colors["original"]
                     elif self.cell_status[i][j] == 1:  # User input
@@ -450,60 +452,109 @@ class SudokuGame:
                     else:  # Hint
                         num_color = self.current_colors["hint"]
                     
-                    num_text = self.large_font.render(str(self.board[i][j]), True, num_color)
-                    num_rect = num_text.get_rect(center=(cell_x + GRID_SIZE // 2, cell_y + GRID_SIZE // 2))
-                    self.screen.blit(num_text, num_rect)
+                    # Highlight numbers that clash with another one in their row, column or box
+                    if self.cell_status[i][j] == 1 and self.conflicts.in_conflict(i, j):
+                        num_color = ERROR_COLOR
+                
+                # Skip cells that look the same as last time
+                look = (num, num_color, cell_color)
+                if self.drawn_cells[i * 9 + j] == look:
+                    continue
+                self.drawn_cells[i * 9 + j] = look
+                
+                # Draw cell background
+                cell_x = offset_x + j * GRID_SIZE
+                cell_y = offset_y + i * GRID_SIZE
+                pygame.draw.rect(self.screen, cell_color, (cell_x, cell_y, GRID_SIZE, GRID_SIZE))
+                
+                # Blit the pre-rendered digit centered in the cell
+                if num != 0:
+                    glyph, glyph_x, glyph_y = glyphs[(num, num_color)]
+                    self.screen.blit(glyph, (cell_x + glyph_x, cell_y + glyph_y))
+                
+                # Put back the grid lines around the cell
+                cell_rect = pygame.Rect(cell_x - GRID_MARGIN, cell_y - GRID_MARGIN,
+                                        GRID_SIZE + 2 * GRID_MARGIN, GRID_SIZE + 2 * GRID_MARGIN)
+                layer_area = cell_rect.move(GRID_MARGIN - offset_x, GRID_MARGIN - offset_y)
+                self.screen.blit(self.grid_layer, cell_rect, layer_area)
+                dirty_rects.append(cell_rect)
+        
+        return dirty_rects
+    
+    def build_board_layers(self):
+        # Render everything on the board that only changes with the theme
+        self.build_glyphs()
         
-        # Draw the grid lines
+        # Draw the grid lines once on a transparent layer that is laid over redrawn cells
+        layer_size = BOARD_SIZE + 2 * GRID_MARGIN
+        self.grid_layer = pygame.Surface((layer_size, layer_size), pygame.SRCALPHA)
         for i in range(10):
             line_width = 3 if i % 3 == 0 else 1
+            line_pos = GRID_MARGIN + i * GRID_SIZE
             
             # Vertical lines
-            pygame.draw.line(self.screen, self.current_colors["grid"], 
-                            (offset_x + i * GRID_SIZE, offset_y), 
-                            (offset_x + i * GRID_SIZE, offset_y + BOARD_SIZE), line_width)
+            pygame.draw.line(self.grid_layer, self.current_colors["grid"],
+                            (line_pos, GRID_MARGIN), (line_pos, GRID_MARGIN + BOARD_SIZE), line_width)
             
             # Horizontal lines
-            pygame.draw.line(self.screen, self.current_colors["grid"], 
-                            (offset_x, offset_y + i * GRID_SIZE), 
-                            (offset_x + BOARD_SIZE, offset_y + i * GRID_SIZE), line_width)
+            pygame.draw.line(self.grid_layer, self.current_colors["grid"],
+                            (GRID_MARGIN, line_pos), (GRID_MARGIN + BOARD_SIZE, line_pos), line_width)
+        self.layers_theme = self.theme
+    
+    def build_glyphs(self):
+        # Pre-render every digit in every color the board uses with the current theme,
+        # keyed by (digit, color) together with its offset to center it in a cell
+        self.glyphs = {}
+        colors = (self.current_colors["original"], self.current_colors["user_input"],
+                  self.current_colors["hint"], ERROR_COLOR)
+        for color in colors:
+            for num in range(1, 10):
+                glyph = self.large_font.render(str(num), True, color)
+                glyph_rect = glyph.get_rect(center=(GRID_SIZE // 2, GRID_SIZE // 2))
+                self.glyphs[(num, color)] = (glyph, glyph_rect.x, glyph_rect.y)
     
     def draw_game_screen(self):
-        # Clear the screen
-        self.screen.fill(self.current_colors["bg"])
+        # Redraw everything after another screen was shown, otherwise only what changed.
+        # Returns the rectangles to push to the display, None when the whole screen changed
+        full_redraw = not self.game_screen_valid or self.layers_theme != self.theme
+        if full_redraw:
+            # Clear the screen
+            self.screen.fill(self.current_colors["bg"])
+            self.drawn_cells = [None] * 81
+            self.game_screen_valid = True
         
         # Draw the board
-        self.draw_board()
+        dirty_rects = self.draw_board()
+        
+        # Clear the strips above and below the board, they are redrawn every frame
+        offset_y = (HEIGHT - BOARD_SIZE) // 2 - 50
+        info_rect = pygame.Rect(0, 0, WIDTH, offset_y - GRID_MARGIN)
+        buttons_rect = pygame.Rect(0, offset_y + BOARD_SIZE + GRID_MARGIN, WIDTH,
+                                   HEIGHT - offset_y - BOARD_SIZE - GRID_MARGIN)
+        self.screen.fill(self.current_colors["bg"], info_rect)
+        self.screen.fill(self.current_colors["bg"], buttons_rect)
         
         # Draw game info
         self.draw_game_info()
 
-        button_y = HEIGHT - 75
         # Draw buttons
-        buttons = []
-        buttons.append(self.create_button("HINT", WIDTH // 6, button_y, self.give_hint))
-        buttons.append(self.create_button("MARK", WIDTH // 6 * 2, button_y, self.toggle_mark))
-        buttons.append(self.create_button("CLEAR", WIDTH // 6 * 3, button_y, self.clear_board))
-        buttons.append(self.create_button("SAVE", WIDTH // 6 * 4, button_y, self.save_game))
-        buttons.append(self.create_button("SOLVE", WIDTH // 6 * 5, button_y, self.select_algorithm))
-        buttons.append(self.create_button("BACK", 300, 40, self.go_back))
-        
-        # Handle button events and draw them
-        for button in buttons:
-            self.handle_button(button)
-            self.draw_button(button)
+        self.draw_widgets(self.get_widgets(GameState.NEW_GAME))
         
         # Update elapsed time if game is active
         if self.start_time and not self.paused:
             self.elapsed_time = time.time() - self.start_time + self.elapsed_time
             self.start_time = time.time()
+        
+        if full_redraw:
+            return None
+        return dirty_rects + [info_rect, buttons_rect]
     
     def clear_board(self):
         # Clear all user inputs and marked cells from the board
         for i in range(9):
             for j in range(9):
                 if self.original_board[i][j] == 0:  # Only clear user input cells
-                    self.board[i][j] = 0  # Set the cell to empty
+                    self.set_cell(i, j, 0)  # Set the cell to empty
                     # self.cell_status[i][j] = 0  # Reset cell status to original
         
         # Clear all marked cells
@@ -518,6 +569,7 @@ class SudokuGame:
         self.screen.blit(diff_text, (20, 20))
         
         # Draw time
+        self.shown_seconds = int(self.elapsed_time)
         time_str = self.format_time(self.elapsed_time)
         time_text = self.medium_font.render(f"Time: {time_str}", True, self.current_colors["text"])
         self.screen.blit(time_text, (WIDTH - 150, 20))
@@ -526,23 +578,66 @@ class SudokuGame:
         hint_text = self.medium_font.render(f"Hints: {self.hints_used}", True, self.current_colors["text"])
         self.screen.blit(hint_text, (WIDTH - 150, 50))
         
-        # Draw algorithm solve time if applicable
+        # Draw algorithm solve time and the solver's work counters under the board, so a slow
+        # solve can be told apart as more search or as more time per node
         if self.algo_solve_time > 0:
-            algo_text = self.small_font.render(f"Solve time: {self.algo_solve_time:.6f}s", True, self.current_colors["text"])
-            self.screen.blit(algo_text, (20, 50))
+            algo_lines = [f"Solve time: {self.algo_solve_time:.6f}s"]
+            stats = self.algo_stats
+            if stats is not None:
+                algo_lines[0] += f"   Nodes: {stats.nodes:,}   Guesses: {stats.guesses:,}   Max depth: {stats.max_depth}"
+                algo_lines.append(f"Checks: {stats.checks:,}   Backtracks: {stats.backtracks:,}   "
+                                  f"Eliminations: {stats.eliminations:,}")
+            line_y = (HEIGHT - BOARD_SIZE) // 2 - 50 + BOARD_SIZE + 12
+            for line in algo_lines:
+                algo_text = self.small_font.render(line, True, self.current_colors["text"])
+                self.screen.blit(algo_text, algo_text.get_rect(midtop=(WIDTH // 2, line_y)))
+                line_y += 20
+            
+            # Report the entries a "solve from here" had to throw away
+            if self.wrong_entries:
+                cells = ", ".join(f"r{row + 1}c{col + 1}" for row, col in self.wrong_entries[:6])
+                if len(self.wrong_entries) > 6:
+                    cells += ", ..."
+                wrong_text = self.small_font.render(f"Wrong entries: {len(self.wrong_entries)} ({cells})", True, ERROR_COLOR)
+                self.screen.blit(wrong_text, wrong_text.get_rect(midtop=(WIDTH // 2, line_y)))
     
     def draw_settings_screen(self):
-        # Clear the screen
-        self.screen.fill(self.current_colors["bg"])
+        widgets = self.get_widgets(GameState.SETTINGS)
+        
+        # Highlight the current difficulty and theme
+        for diff, btn in zip(Difficulty, widgets["difficulty"]):
+            btn["active"] = self.difficulty == diff
+        for theme, btn in zip(Theme, widgets["theme"]):
+            btn["active"] = self.theme == theme
+        
+        # Draw the background and buttons
+        self.draw_widgets(widgets)
+        
+        # Draw volume setting, rendered again only when the value changes
+        vol_label = f"Volume: {int(self.sound_volume * 100)}%"
+        if widgets["volume_label"] != vol_label:
+            widgets["volume_label"] = vol_label
+            widgets["volume_text"] = self.medium_font.render(vol_label, True, self.current_colors["text"])
+        self.screen.blit(widgets["volume_text"], (WIDTH//4 - 100, HEIGHT * 3//4))
+        
+        # Draw slider handle, the slider is dragged through mouse events
+        slider = widgets["slider"]
+        handle_x = slider.x + int(self.sound_volume * slider.width)
+        pygame.draw.circle(self.screen, self.current_colors["button"], (handle_x, slider.y + 5), 10)
+    
+    def build_settings_widgets(self):
+        # Clear the background
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(self.current_colors["bg"])
         
         # Draw title
         title_text = self.large_font.render("SETTINGS", True, self.current_colors["text"])
         title_rect = title_text.get_rect(center=(WIDTH//2, 60))
-        self.screen.blit(title_text, title_rect)
+        background.blit(title_text, title_rect)
         
         # Draw difficulty setting
         diff_text = self.medium_font.render("Difficulty:", True, self.current_colors["text"])
-        self.screen.blit(diff_text, (WIDTH//4 - 100, HEIGHT//4))
+        background.blit(diff_text, (WIDTH//4 - 100, HEIGHT//4))
         
         # Difficulty buttons
         diff_buttons = []
@@ -550,12 +645,11 @@ class SudokuGame:
         for i, diff in enumerate(difficulties):
             btn = self.create_button(diff.value["name"], WIDTH//2, HEIGHT//4 + i * 60, 
                                      lambda d=diff: self.set_difficulty(d))
-            btn["active"] = self.difficulty == diff
             diff_buttons.append(btn)
         
         # Draw theme setting
         theme_text = self.medium_font.render("Theme:", True, self.current_colors["text"])
-        self.screen.blit(theme_text, (WIDTH//4 - 100, HEIGHT//2))
+        background.blit(theme_text, (WIDTH//4 - 100, HEIGHT//2))
         
         # Theme buttons
         theme_buttons = []
@@ -563,41 +657,33 @@ class SudokuGame:
         for i, theme in enumerate(themes):
             btn = self.create_button(theme.name.capitalize(), WIDTH//2, HEIGHT//2 + i * 60, 
                                     lambda t=theme: self.set_theme(t))
-            btn["active"] = self.theme == theme
             theme_buttons.append(btn)
         
-        # Draw volume setting
-        vol_text = self.medium_font.render(f"Volume: {int(self.sound_volume * 100)}%", True, self.current_colors["text"])
-        self.screen.blit(vol_text, (WIDTH//4 - 100, HEIGHT * 3//4))
-        
-        # Volume slider (simplified)
+        # Draw slider background
         slider_width = 200
         slider_x = WIDTH//2 - slider_width//2
         slider_y = HEIGHT * 3//4 + 10
+        slider = pygame.Rect(slider_x, slider_y, slider_width, 10)
+        pygame.draw.rect(background, GRAY, slider)
         
-        # Draw slider background
-        pygame.draw.rect(self.screen, GRAY, (slider_x, slider_y, slider_width, 10))
-        
-        # Draw slider handle
-        handle_x = slider_x + int(self.sound_volume * slider_width)
-        pygame.draw.circle(self.screen, self.current_colors["button"], (handle_x, slider_y + 5), 10)
-        
-        # Check if slider is being dragged
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()[0]
-        
-        if mouse_pressed and slider_y - 10 <= mouse_pos[1] <= slider_y + 20:
-            if slider_x <= mouse_pos[0] <= slider_x + slider_width:
-                self.sound_volume = (mouse_pos[0] - slider_x) / slider_width
-                self.sound_volume = max(0, min(1, self.sound_volume))
+        # Draw generation mode setting
+        gen_text = self.medium_font.render("Generator:", True, self.current_colors["text"])
+        background.blit(gen_text, (WIDTH//4 - 100, HEIGHT * 3//4 + 50))
+        gen_button = self.create_button(self.generation_mode.value, WIDTH//2, HEIGHT * 3//4 + 60,
+                                        self.toggle_generation_mode)
         
         # Back button
         back_button = self.create_button("BACK", WIDTH//2, HEIGHT - 50, self.go_back)
         
-        # Handle buttons
-        for button in diff_buttons + theme_buttons + [back_button]:
-            self.handle_button(button)
-            self.draw_button(button)
+        return {
+            "background": background,
+            "buttons": diff_buttons + theme_buttons + [gen_button, back_button],
+            "difficulty": diff_buttons,
+            "theme": theme_buttons,
+            "slider": slider,
+            "volume_label": None,
+            "volume_text": None
+        }
     
     # def draw_high_scores_screen(self):
     #     # Clear the screen
@@ -649,13 +735,18 @@ class SudokuGame:
     #     self.draw_button(back_button)
     
     def draw_high_scores_screen(self):
-        # Clear the screen
-        self.screen.fill(self.current_colors["bg"])
+        # Draw the background and buttons
+        self.draw_widgets(self.get_widgets(GameState.HIGH_SCORES))
+    
+    def build_high_scores_widgets(self):
+        # Clear the background
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(self.current_colors["bg"])
         
         # Draw title
         title_text = self.large_font.render("HIGH SCORES", True, self.current_colors["text"])
         title_rect = title_text.get_rect(center=(WIDTH//2, 60))
-        self.screen.blit(title_text, title_rect)
+        background.blit(title_text, title_rect)
         
         # Sort high scores by score (lower is better)
         sorted_scores = sorted(self.high_scores, key=lambda x: x["score"])
@@ -674,77 +765,239 @@ class SudokuGame:
                 
                 # Draw rank
                 rank_text = self.medium_font.render(f"{i+1}.", True, self.current_colors["text"])
-                self.screen.blit(rank_text, (WIDTH//4 - 80, y_pos))
+                background.blit(rank_text, (WIDTH//4 - 80, y_pos))
                 
                 # Draw name
                 name_text = self.medium_font.render(name, True, self.current_colors["text"])
-                self.screen.blit(name_text, (WIDTH//4, y_pos))
+                background.blit(name_text, (WIDTH//4, y_pos))
                 
                 # Draw difficulty
                 diff_text = self.medium_font.render(diff_name, True, self.current_colors["text"])
-                self.screen.blit(diff_text, (WIDTH//2 - 50, y_pos))
+                background.blit(diff_text, (WIDTH//2 - 50, y_pos))
                 
                 # Draw time
                 time_text = self.medium_font.render(time_str, True, self.current_colors["text"])
-                self.screen.blit(time_text, (WIDTH//2 + 60, y_pos))
+                background.blit(time_text, (WIDTH//2 + 60, y_pos))
                 
                 # Draw hints
                 hints_text = self.medium_font.render(f"Hints: {hints}", True, self.current_colors["text"])
-                self.screen.blit(hints_text, (WIDTH * 3//4, y_pos))
+                background.blit(hints_text, (WIDTH * 3//4, y_pos))
         else:
             # Display message if no high scores
             no_scores_text = self.medium_font.render("No high scores yet!", True, self.current_colors["text"])
             no_scores_rect = no_scores_text.get_rect(center=(WIDTH//2, HEIGHT//2))
-            self.screen.blit(no_scores_text, no_scores_rect)
+            background.blit(no_scores_text, no_scores_rect)
         
         # Back button
         back_button = self.create_button("BACK", WIDTH//2, HEIGHT - 50, self.go_back)
-        self.handle_button(back_button)
-        self.draw_button(back_button)
+        
+        return {"background": background, "buttons": [back_button]}
 
 
     def draw_quit_confirm_screen(self):
-        # Clear the screen
-        self.screen.fill(self.current_colors["bg"])
+        # Draw the background and buttons
+        self.draw_widgets(self.get_widgets(GameState.QUIT_CONFIRM))
+    
+    def build_quit_confirm_widgets(self):
+        # Clear the background
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(self.current_colors["bg"])
         
         # Draw confirmation message
         quit_text = self.large_font.render("Are you sure you want to quit?", True, self.current_colors["text"])
         quit_rect = quit_text.get_rect(center=(WIDTH//2, HEIGHT//2 - 50))
-        self.screen.blit(quit_text, quit_rect)
+        background.blit(quit_text, quit_rect)
         
-        # Draw buttons
+        # Create buttons
         yes_button = self.create_button("YES", WIDTH//2 - 75, HEIGHT//2 + 50, self.quit_game)
         no_button = self.create_button("NO", WIDTH//2 + 75, HEIGHT//2 + 50, self.go_back)
         
-        # Handle button events and draw them
-        self.handle_button(yes_button)
-        self.draw_button(yes_button)
-        self.handle_button(no_button)
-        self.draw_button(no_button)
+        return {"background": background, "buttons": [yes_button, no_button]}
     
     def draw_algorithm_select_screen(self):
-        # Clear the screen
+        widgets = self.get_widgets(GameState.ALGORITHM_SELECT)
+        
+        # Replaying only works once a solve was recorded
+        widgets["replay"]["action"] = self.open_replay if self.trace else None
+        
+        # Draw the background and buttons
+        self.draw_widgets(widgets)
+    
+    def draw_replay_screen(self):
+        widgets = self.get_widgets(GameState.REPLAY)
+        self.advance_replay()
+        
+        # Draw the board as it was at the current step
         self.screen.fill(self.current_colors["bg"])
+        self.game_screen_valid = False
+        self.board = self.replay.to_board()
+        self.conflicts.load(self.board)
+        if self.replay.last_index is not None:
+            self.active_cell = divmod(self.replay.last_index, 9)
+        self.drawn_cells = [None] * 81
+        self.draw_board()
+        
+        # Draw the step counter and speed
+        step_text = self.medium_font.render(f"Step {self.replay.position} / {len(self.replay)}", True, self.current_colors["text"])
+        self.screen.blit(step_text, (20, 20))
+        if not self.replay_playing:
+            speed = "Paused"
+        else:
+            speed = f"x{self.solver_turbo}" if self.replay_direction > 0 else f"-x{self.solver_turbo}"
+        speed_text = self.medium_font.render(speed, True, self.current_colors["text"])
+        self.screen.blit(speed_text, (WIDTH - 150, 20))
+        
+        # Draw the seek bar with a handle at the current step
+        seek_bar = widgets["seek"]
+        pygame.draw.rect(self.screen, GRAY, seek_bar)
+        handle_x = seek_bar.x + seek_bar.width * self.replay.position // max(1, len(self.replay))
+        pygame.draw.circle(self.screen, self.current_colors["button"], (handle_x, seek_bar.y + 5), 10)
+        
+        # Draw buttons
+        self.draw_widgets(widgets)
+    
+    def build_algorithm_select_widgets(self):
+        # Clear the background
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(self.current_colors["bg"])
         
         # Draw title
         title_text = self.large_font.render("SELECT SOLVING ALGORITHM", True, self.current_colors["text"])
         title_rect = title_text.get_rect(center=(WIDTH//2, HEIGHT//3 - 50))
-        self.screen.blit(title_text, title_rect)
+        background.blit(title_text, title_rect)
         
-        # Draw buttons
+        # Create buttons
+        start_label = "Start From: My Entries" if self.solve_from_here else "Start From: Puzzle"
+        start_button = self.create_button(start_label, WIDTH//2, HEIGHT//2 - 90, self.toggle_solve_from_here)
         backtrack_button = self.create_button("Backtracking", WIDTH//2, HEIGHT//2 - 30, 
                                              lambda: self.solve_puzzle("backtracking"))
         constraint_button = self.create_button("Constraint Propagation Backtracking", WIDTH//2, HEIGHT//2 + 30, 
                                               lambda: self.solve_puzzle("constraint"))
-        back_button = self.create_button("BACK", WIDTH//2, HEIGHT//2 + 90, self.go_back)
+        dlx_button = self.create_button("Dancing Links", WIDTH//2, HEIGHT//2 + 90,
+                                        lambda: self.solve_puzzle("dlx"))
+        replay_button = self.create_button("Replay Last Solve", WIDTH//2, HEIGHT//2 + 150, None)
+        back_button = self.create_button("BACK", WIDTH//2, HEIGHT//2 + 210, self.go_back)
+        
+        return {
+            "background": background,
+            "buttons": [start_button, backtrack_button, constraint_button, dlx_button, replay_button, back_button],
+            "replay": replay_button
+        }
+    
+    def build_replay_widgets(self):
+        # Transport buttons under the board, the board itself is drawn every frame
+        button_y = HEIGHT - 75
+        buttons = []
+        buttons.append(self.create_button("|<", WIDTH // 8, button_y, lambda: self.seek_replay(0)))
+        buttons.append(self.create_button("<<", WIDTH // 8 * 2, button_y, lambda: self.play_replay(-1)))
+        buttons.append(self.create_button("||", WIDTH // 8 * 3, button_y, self.pause_replay))
+        buttons.append(self.create_button(">>", WIDTH // 8 * 4, button_y, lambda: self.play_replay(1)))
+        buttons.append(self.create_button(">|", WIDTH // 8 * 5, button_y, lambda: self.seek_replay(len(self.replay))))
+        buttons.append(self.create_button("-", WIDTH // 8 * 6, button_y, lambda: self.change_solver_turbo(-1)))
+        buttons.append(self.create_button("+", WIDTH // 8 * 7, button_y, lambda: self.change_solver_turbo(1)))
+        buttons.append(self.create_button("BACK", 300, 40, self.close_replay))
+        
+        # Click or drag on the seek bar to jump to a step
+        offset_x = (WIDTH - BOARD_SIZE) // 2
+        seek_bar = pygame.Rect(offset_x, HEIGHT - 35, BOARD_SIZE, 10)
         
-        # Handle button events and draw them
-        self.handle_button(backtrack_button)
-        self.draw_button(backtrack_button)
-        self.handle_button(constraint_button)
-        self.draw_button(constraint_button)
-        self.handle_button(back_button)
-        self.draw_button(back_button)
+        return {"background": None, "buttons": buttons, "seek": seek_bar}
+    
+    def build_game_widgets(self):
+        # The game screen draws its own background, only the buttons are kept
+        button_y = HEIGHT - 75
+        buttons = []
+        buttons.append(self.create_button("HINT", WIDTH // 6, button_y, self.give_hint))
+        buttons.append(self.create_button("MARK", WIDTH // 6 * 2, button_y, self.toggle_mark))
+        buttons.append(self.create_button("CLEAR", WIDTH // 6 * 3, button_y, self.clear_board))
+        buttons.append(self.create_button("SAVE", WIDTH // 6 * 4, button_y, self.save_game))
+        buttons.append(self.create_button("SOLVE", WIDTH // 6 * 5, button_y, self.select_algorithm))
+        buttons.append(self.create_button("BACK", 300, 40, self.go_back))
+        
+        return {"background": None, "buttons": buttons}
+    
+    def build_solving_widgets(self):
+        # Stop and Skip buttons shown under the board while a solver is visualized
+        stop_button = self.create_button("STOP", WIDTH // 3, HEIGHT - 30, self.request_stop_solving)
+        turbo_button = self.create_button("TURBO", WIDTH // 2, HEIGHT - 30, self.cycle_solver_turbo)
+        skip_button = self.create_button("SKIP", WIDTH * 2 // 3, HEIGHT - 30, self.request_skip_solving)
+        
+        return {
+            "background": None,
+            "buttons": [stop_button, turbo_button, skip_button],
+            "turbo_label": None,
+            "turbo_text": None
+        }
+    
+    def get_widgets(self, screen):
+        # Return the widgets of a screen, building them the first time it is shown with
+        # the current theme. The solving controls use the key "solving"
+        widgets = self.widgets.get(screen)
+        if widgets is None:
+            builders = {
+                GameState.WELCOME: self.build_welcome_widgets,
+                GameState.NEW_GAME: self.build_game_widgets,
+                GameState.SETTINGS: self.build_settings_widgets,
+                GameState.HIGH_SCORES: self.build_high_scores_widgets,
+                GameState.QUIT_CONFIRM: self.build_quit_confirm_widgets,
+                GameState.ALGORITHM_SELECT: self.build_algorithm_select_widgets,
+                GameState.REPLAY: self.build_replay_widgets,
+                "solving": self.build_solving_widgets
+            }
+            widgets = builders[screen]()
+            
+            # New buttons start out knowing whether the mouse is over them
+            mouse_pos = pygame.mouse.get_pos()
+            for button in widgets["buttons"]:
+                button["hover"] = bool(button["rect"].collidepoint(mouse_pos))
+            self.widgets[screen] = widgets
+        return widgets
+    
+    def invalidate_widgets(self, screen=None):
+        # Drop the widgets of one screen, or of all screens, so they are built again
+        if screen is None:
+            self.widgets = {}
+        else:
+            self.widgets.pop(screen, None)
+    
+    def update_hover(self, pos):
+        # Update the hover state of every built button from a mouse position
+        for widgets in self.widgets.values():
+            for button in widgets["buttons"]:
+                button["hover"] = bool(button["rect"].collidepoint(pos))
+    
+    def draw_widgets(self, widgets):
+        # Blit a screen's pre-rendered background and buttons, a full background
+        # covers the game screen so it has to be drawn whole next time
+        if widgets["background"] is not None:
+            self.screen.blit(widgets["background"], (0, 0))
+            self.game_screen_valid = False
+        for button in widgets["buttons"]:
+            self.draw_button(button)
+    
+    def press_widget(self, widgets, pos):
+        # Start a click on the button under a left mouse press, it fires on release.
+        # Returns whether the press belongs to a button
+        if pygame.time.get_ticks() - self.last_click_time < CLICK_DEBOUNCE:
+            return True
+        for button in widgets["buttons"]:
+            if button["action"] and button["rect"].collidepoint(pos):
+                self.pressed_button = button
+                return True
+        return False
+    
+    def release_widget(self, widgets, pos):
+        # Fire the pressed button if the mouse is released over it, once per press
+        button = self.pressed_button
+        self.pressed_button = None
+        if button is not None and button in widgets["buttons"] and button["rect"].collidepoint(pos):
+            self.last_click_time = pygame.time.get_ticks()
+            self.click_button(button)
+    
+    def set_volume_from(self, x):
+        # Move the volume slider handle to a mouse position
+        slider = self.get_widgets(GameState.SETTINGS)["slider"]
+        self.sound_volume = max(0, min(1, (x - slider.x) / slider.width))
     
     def create_button(self, text, x, y, action=None):
         # Create a button dictionary
@@ -753,47 +1006,35 @@ class SudokuGame:
         button_rect = pygame.Rect(text_rect.left - 10, text_rect.top - 5, 
                                 text_rect.width + 20, text_rect.height + 10)
         
+        # Pre-render the button as it looks normally and with the mouse over it
+        surfaces = {}
+        for hover, color in ((False, self.current_colors["button"]), (True, self.current_colors["button_hover"])):
+            surface = pygame.Surface(button_rect.size, pygame.SRCALPHA).convert_alpha()
+            pygame.draw.rect(surface, color, surface.get_rect(), border_radius=5)
+            pygame.draw.rect(surface, BLACK, surface.get_rect(), 2, border_radius=5)
+            surface.blit(text_surf, text_rect.move(-button_rect.left, -button_rect.top))
+            surfaces[hover] = surface
+        
         return {
             "rect": button_rect,
             "text": text,
             "text_surf": text_surf,
             "text_rect": text_rect,
+            "surfaces": surfaces,
             "action": action,
             "hover": False,
             "active": False
         }
     
-    def handle_button(self, button):
-        # Handle button hover and click events
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_click = pygame.mouse.get_pressed()[0]
-        
-        # Check if mouse is over button
-        button["hover"] = button["rect"].collidepoint(mouse_pos)
-        
-        # Check if button is clicked
-        if button["hover"] and mouse_click and button["action"]:
-            # Small delay to prevent accidental double clicks
-            pygame.time.delay(100)
-            self.play_sound(self.button_sound)
-            button["action"]()
+    def click_button(self, button):
+        # Run a clicked button's action
+        self.play_sound(self.button_sound)
+        button["action"]()
     
     def draw_button(self, button):
-        # Draw button background
-        if button["active"]:
-            color = self.current_colors["button"]
-        elif button["hover"]:
-            color = self.current_colors["button_hover"]
-        else:
-            color = self.current_colors["button"]
-        
-        pygame.draw.rect(self.screen, color, button["rect"], border_radius=5)
-        pygame.draw.rect(self.screen, BLACK, button["rect"], 2, border_radius=5)
-        pygame.draw.rect(self.screen, color, button["rect"], border_radius=5)
-        pygame.draw.rect(self.screen, BLACK, button["rect"], 2, border_radius=5)
-        
-        # Draw button text
-        self.screen.blit(button["text_surf"], button["text_rect"])
+        # Blit the pre-rendered button, the active one never shows the hover color
+        hover = button["hover"] and not button["active"]
+        self.screen.blit(button["surfaces"][hover], button["rect"])
     
     def format_time(self, seconds):
         # Format time as mm:ss
@@ -847,6 +1088,18 @@ class SudokuGame:
         # Set the game theme
         self.theme = theme
         self.current_colors = self.theme.value
+        self.invalidate_widgets()
+        self.play_sound(self.button_sound)
+    
+    def toggle_generation_mode(self):
+        # Switch between searching for new puzzles and transforming seed puzzles
+        if self.generation_mode == GenerationMode.SEARCH:
+            self.generation_mode = GenerationMode.TRANSFORM
+        else:
+            self.generation_mode = GenerationMode.SEARCH
+        self.generator.mode = self.generation_mode
+        self.puzzle_pool.set_mode(self.generation_mode)
+        self.invalidate_widgets(GameState.SETTINGS)
         self.play_sound(self.button_sound)
     
     def select_algorithm(self):
@@ -855,6 +1108,90 @@ class SudokuGame:
         self.current_state = GameState.ALGORITHM_SELECT
         self.play_sound(self.button_sound)
     
+    def toggle_solve_from_here(self):
+        # Switch the solvers between the original puzzle and the player's entries
+        self.solve_from_here = not self.solve_from_here
+        self.invalidate_widgets(GameState.ALGORITHM_SELECT)
+    
+    def open_replay(self):
+        # Play back the recorded solve, the game board is put back when leaving
+        self.replay = TracePlayer(self.trace)
+        self.replay_saved = ([row[:] for row in self.board], self.active_cell)
+        self.replay_direction = 1
+        self.replay_playing = True
+        self.replay_due = 0.0
+        self.replay_time = time.perf_counter()
+        self.previous_state = self.current_state
+        self.current_state = GameState.REPLAY
+        self.play_sound(self.button_sound)
+    
+    def close_replay(self):
+        # Leave the replay and return to the game as it was
+        self.board, self.active_cell = self.replay_saved
+        self.conflicts.load(self.board)
+        self.replay = None
+        self.replay_playing = False
+        self.dragging_seek = False
+        self.current_state = GameState.NEW_GAME
+    
+    def play_replay(self, direction):
+        # Play forward (1) or backward (-1) from the current step
+        self.replay_direction = direction
+        self.replay_playing = True
+        self.replay_due = 0.0
+        self.replay_time = time.perf_counter()
+    
+    def pause_replay(self):
+        self.replay_playing = False
+    
+    def seek_replay(self, position):
+        # Jump to a step and stop there
+        self.replay_playing = False
+        self.replay.seek(position)
+    
+    def seek_replay_from(self, x):
+        # Jump to the step under a mouse position on the seek bar
+        seek_bar = self.get_widgets(GameState.REPLAY)["seek"]
+        fraction = max(0, min(1, (x - seek_bar.x) / seek_bar.width))
+        self.seek_replay(round(fraction * len(self.replay)))
+    
+    def advance_replay(self):
+        # Move the replay by the steps that came due since the last frame
+        now = time.perf_counter()
+        elapsed, self.replay_time = now - self.replay_time, now
+        if not self.replay_playing:
+            return
+        self.replay_due += elapsed * SOLVER_STEPS_PER_SECOND * self.solver_turbo
+        steps = int(self.replay_due)
+        self.replay_due -= steps
+        self.replay.seek(self.replay.position + self.replay_direction * steps)
+        
+        # Stop at either end of the trace
+        if self.replay.position in (0, len(self.replay)):
+            self.replay_playing = False
+    
+    def handle_replay_key(self, key):
+        # Space plays or pauses, arrows step or change speed, Home/End jump, Escape leaves
+        if key == pygame.K_SPACE:
+            if self.replay_playing:
+                self.pause_replay()
+            else:
+                self.play_replay(self.replay_direction)
+        elif key == pygame.K_RIGHT:
+            self.seek_replay(self.replay.position + 1)
+        elif key == pygame.K_LEFT:
+            self.seek_replay(self.replay.position - 1)
+        elif key == pygame.K_HOME:
+            self.seek_replay(0)
+        elif key == pygame.K_END:
+            self.seek_replay(len(self.replay))
+        elif key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.change_solver_turbo(1)
+        elif key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.change_solver_turbo(-1)
+        elif key == pygame.K_ESCAPE:
+            self.close_replay()
+    
     def give_hint(self):
         # Provide a hint if a cell is selected
         if self.active_cell:
@@ -866,7 +1203,7 @@ class SudokuGame:
                 correct_value = self.solved_board[row][col]
                 
                 # Update the board and cell status
-                self.board[row][col] = correct_value
+                self.set_cell(row, col, correct_value)
                 self.cell_status[row][col] = 2  # Mark as hint
                 
                 # Increment hint counter
@@ -885,28 +1222,44 @@ class SudokuGame:
                 self.marked_cells.add(self.active_cell)
             self.play_sound(self.button_sound)
     
-    def solve_puzzle(self, algorithm):
-        # Solve the puzzle using the selected algorithm
+    def solve_puzzle(self, algorithm, record_trace=True):
+        # Solve the puzzle using the selected algorithm, keeping the visualized search
+        # as a trace for replay when 'record_trace' is set
+        self.record_trace = record_trace
+        self.algo_search_time = None
+        
+        # Only a solve that records its steps leaves a trace, Replay must not show an older search
+        self.trace = None
         start_time = time.perf_counter()
-        print(start_time)
-        
-        # Create a copy of the original board to track progress
-        self.progress_board = copy.deepcopy(self.board)
         
         # Set flag for visualization
         self.visualize_solving = True
+        self.algo_stats = None
+        
+        # Solving from here keeps the player's correct entries, checked against the known
+        # solution, so the search only has to fill in the rest
+        if self.solve_from_here:
+            self.solve_start, self.wrong_entries = check_entries(self.board, self.original_board, self.solved_board)
+        else:
+            self.solve_start, self.wrong_entries = self.original_board, []
         
         if algorithm == "backtracking":
             self.solve_with_backtracking()
+        elif algorithm == "dlx":
+            self.solve_with_dancing_links()
         else:  # constraint propagation
             self.solve_with_constraint_propagation()
         
-        # Calculate the time it took to solve
-        self.algo_solve_time = time.perf_counter() - start_time 
-        print(self.algo_solve_time)
+        # Calculate the time it took to solve, a visualized search only counts the time
+        # spent computing its steps so it compares with the solvers that don't animate
+        if self.algo_search_time is not None:
+            self.algo_solve_time = self.algo_search_time
+        else:
+            self.algo_solve_time = time.perf_counter() - start_time
         
         # Update the board with the solution
-        self.board = copy.deepcopy(self.solved_board)
+        self.board = [row[:] for row in self.solved_board]
+        self.conflicts.load(self.board)
         
         # Turn off visualization flag
         self.visualize_solving = False
@@ -916,228 +1269,52 @@ class SudokuGame:
         self.play_sound(self.success_sound)
     
     def solve_with_backtracking(self):
-        # Create a copy of the current board
-        temp_board = copy.deepcopy(self.original_board)
-        
-        # Reset solving control flags
-        self.stop_solving = False
-        self.skip_to_solution = False
-        
-        # Solve using backtracking
-        def backtrack():
-            # Check if solving should be stopped or skipped
-            if self.stop_solving:
-                return False
-            if self.skip_to_solution:
-                return self.solve_board_silently(temp_board)
-                
-            empty = self.find_empty_in_board(temp_board)
-            if not empty:
-                return True
-            
-            row, col = empty
-            
-            for num in range(1, 10):
-                if self.is_valid_in_board(temp_board, row, col, num):
-                    temp_board[row][col] = num
-                    
-                    # Update the progress board and redraw
-                    if hasattr(self, 'visualize_solving') and self.visualize_solving:
-                        self.board = copy.deepcopy(temp_board)
-                        self.active_cell = (row, col)
-                        self.draw_game_screen()
-                        self.draw_solving_controls()
-                        pygame.display.flip()
-                        
-                        # Process events to check for stop/skip button presses
-                        self.process_solving_events()
-                        pygame.time.delay(20)  # Add a small delay to see the progress
-                    
-                    if backtrack():
-                        return True
-                    
-                    temp_board[row][col] = 0
-                    
-                    # Show backtracking visually
-                    if hasattr(self, 'visualize_solving') and self.visualize_solving and not self.stop_solving and not self.skip_to_solution:
-                        self.board = copy.deepcopy(temp_board)
-                        self.active_cell = (row, col)
-                        self.draw_game_screen()
-                        self.draw_solving_controls()
-                        pygame.display.flip()
-                        
-                        # Process events to check for stop/skip button presses
-                        self.process_solving_events()
-                        pygame.time.delay(5)  # Shorter delay for backtracking
-            
-            return False
-        
-        result = backtrack()
+        # Solve the start board with the iterative backtracking solver
+        solver = IterativeSolver(self.solve_start, record_steps=self.visualize_solving)
+        if self.visualize_solving:
+            self.play_solver_steps(solver.iter_steps())
+        else:
+            solver.run()
+        self.algo_stats = solver.stats()
         
         # If solving was stopped, keep current board state instead of restoring original
-        if self.stop_solving:
-            # Don't restore the original board, keep current progress
+        if self.stop_solving or solver.status != SolverStatus.SOLVED:
             return
         
         # Update the solved board
-        self.solved_board = copy.deepcopy(temp_board)
+        self.solved_board = solver.to_board()
         self.paused = True
     
-    def find_empty_in_board(self, board):
-        # Find an empty cell in the given board
-        for i in range(9):
-            for j in range(9):
-                if board[i][j] == 0:
-                    return (i, j)
-        return None
-    
-    def is_valid_in_board(self, board, row, col, num):
-        # Check if placing 'num' at position (row, col) is valid in the given board
-        # Check row
-        for j in range(9):
-            if board[row][j] == num:
-                return False
-        
-        # Check column
-        for i in range(9):
-            if board[i][col] == num:
-                return False
-        
-        # Check 3x3 box
-        box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if board[i][j] == num:
-                    return False
-        
-        return True
-    
     def solve_with_constraint_propagation(self):
-        # Implement a more efficient solving algorithm using constraint propagation
-        # This is a simplified version of the algorithm
-        
-        # Create a copy of the current board
-        temp_board = copy.deepcopy(self.original_board)
-        
-        # Create a dictionary of possible values for each cell
-        possible_values = {}
-        for i in range(9):
-            for j in range(9):
-                if temp_board[i][j] == 0:
-                    possible_values[(i, j)] = set(range(1, 10))
-                    
-                    # Remove values that are already in the row, column, or box
-                    for k in range(9):
-                        # Check row
-                        if temp_board[i][k] != 0:
-                            possible_values[(i, j)].discard(temp_board[i][k])
-                        
-                        # Check column
-                        if temp_board[k][j] != 0:
-                            possible_values[(i, j)].discard(temp_board[k][j])
-                    
-                    # Check box
-                    box_row, box_col = 3 * (i // 3), 3 * (j // 3)
-                    for r in range(box_row, box_row + 3):
-                        for c in range(box_col, box_col + 3):
-                            if temp_board[r][c] != 0:
-                                possible_values[(i, j)].discard(temp_board[r][c])
-        
-        # Solve using constraint propagation and backtracking
-        def constraint_backtrack():
-            # If no more empty cells, puzzle is solved
-            if not possible_values:
-                return True
-            
-            # Find the cell with the fewest possible values
-            min_cell = min(possible_values, key=lambda cell: len(possible_values[cell]))
-            
-            # Try each possible value
-            for value in list(possible_values[min_cell]):
-                row, col = min_cell
-                
-                # Check if placing value is still valid
-                if self.is_valid_in_board(temp_board, row, col, value):
-                    # Place the value
-                    temp_board[row][col] = value
-                    
-                    # Update visualization
-                    if hasattr(self, 'visualize_solving') and self.visualize_solving:
-                        self.board = copy.deepcopy(temp_board)
-                        self.active_cell = (row, col)
-                        self.draw_game_screen()
-                        pygame.display.flip()
-                        pygame.time.delay(15)  # Add delay to see progress
-                    
-                    # Remove the cell from possible_values
-                    del_possible_values = possible_values.pop(min_cell)
-                    
-                    # Store affected cells and their previous possible values
-                    affected_cells = {}
-                    
-                    # Update possible values for affected cells
-                    for i in range(9):
-                        # Row cells
-                        if (i, col) in possible_values and value in possible_values[(i, col)]:
-                            affected_cells[(i, col)] = possible_values[(i, col)].copy()
-                            possible_values[(i, col)].discard(value)
-                        
-                        # Column cells
-                        if (row, i) in possible_values and value in possible_values[(row, i)]:
-                            affected_cells[(row, i)] = possible_values[(row, i)].copy()
-                            possible_values[(row, i)].discard(value)
-                    
-                    # Box cells
-                    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-                    for i in range(box_row, box_row + 3):
-                        for j in range(box_col, box_col + 3):
-                            if (i, j) in possible_values and value in possible_values[(i, j)]:
-                                affected_cells[(i, j)] = possible_values[(i, j)].copy()
-                                possible_values[(i, j)].discard(value)
-                    
-                    # Continue with backtracking
-                    if constraint_backtrack():
-                        return True
-                    
-                    # If not successful, backtrack
-                    temp_board[row][col] = 0
-                    
-                    # Show backtracking visually
-                    if hasattr(self, 'visualize_solving') and self.visualize_solving:
-                        self.board = copy.deepcopy(temp_board)
-                        self.active_cell = (row, col)
-                        self.draw_game_screen()
-                        pygame.display.flip()
-                        pygame.time.delay(5)  # Shorter delay for backtracking
-                    
-                    # Restore affected cells
-                    for cell, prev_values in affected_cells.items():
-                        possible_values[cell] = prev_values
-                    
-                    # Restore the current cell
-                    possible_values[min_cell] = del_possible_values
-            
-            return False
+        # Solve using constraint propagation: every assignment is followed by
+        # naked and hidden singles until nothing changes, and the search only
+        # guesses on the cell with the fewest candidates when propagation stalls
+        solver = PropagationSolver(self.solve_start)
+        if self.visualize_solving:
+            self.play_solver_steps(solver.iter_steps())
+        else:
+            solver.solve()
+        self.algo_stats = solver.stats()
         
-        constraint_backtrack()
+        # Update the solved board
+        if not self.stop_solving and solver.solution:
+            self.solved_board = solver.solution.to_board()
+    
+    def solve_with_dancing_links(self):
+        # Solve the start board as an exact cover problem with Dancing Links
+        solver = DancingLinks(self.solve_start)
+        found = solver.solve()
+        self.algo_stats = solver.stats()
+        if found == 0:
+            return
         
         # Update the solved board
-        self.solved_board = copy.deepcopy(temp_board)
-
+        self.solved_board = solver.solution_board()
     
-    def check_if_valid(self):
-    # Check each cell in the board
-        for row in range(9):
-            for col in range(9):
-                num = self.board[row][col]
-                if num != 0:  # Ignore empty cells
-                    # Temporarily clear the cell to check validity
-                    self.board[row][col] = 0
-                    if not self.is_valid(row, col, num):
-                        self.board[row][col] = num  # Restore the cell
-                        return False
-                    self.board[row][col] = num  # Restore the cell
-        return True
+    def set_cell(self, row, col, num):
+        # Change a cell on the shown board and keep the conflict counts in step
+        self.board[row][col] = num
+        self.conflicts.set(row, col, num)
     
     # def add_high_score(self):
     #     # Calculate score (lower is better)
@@ -1167,6 +1344,7 @@ class SudokuGame:
             "hints": self.hints_used,
             "score": score
         })
+        self.invalidate_widgets(GameState.HIGH_SCORES)
         
         # Save high scores
         self.save_data()
@@ -1177,6 +1355,9 @@ class SudokuGame:
         player_name = ""
         input_active = True
 
+        # This screen draws over the game screen
+        self.game_screen_valid = False
+        
         # Define the messages
         congrats_message = "Congratulations! You've completed the puzzle!"
         name_prompt = "Please type your name:"
@@ -1217,23 +1398,59 @@ class SudokuGame:
         return player_name
 
     
-    def handle_events(self):
-        # Handle pygame events
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        # Handle pygame events, the pending ones unless the main loop already collected them
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.save_data()
                 pygame.quit()
                 sys.exit()
             
+            elif event.type == pygame.VIDEOEXPOSE:
+                # The window contents were lost, redraw everything
+                self.game_screen_valid = False
+            
+            elif event.type == pygame.MOUSEMOTION:
+                # Keep button hover states in step with the mouse
+                self.update_hover(event.pos)
+                if self.dragging_volume:
+                    self.set_volume_from(event.pos[0])
+                if self.dragging_seek:
+                    self.seek_replay_from(event.pos[0])
+            
+            elif event.type == pygame.MOUSEBUTTONUP:
+                # A click fires when the left button is released over the button it started on
+                if event.button == 1:
+                    self.dragging_volume = False
+                    self.dragging_seek = False
+                    self.release_widget(self.get_widgets(self.current_state), event.pos)
+            
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # Handle mouse clicks
                 if event.button == 1:  # Left click
-                    if self.current_state == GameState.NEW_GAME:
+                    if self.press_widget(self.get_widgets(self.current_state), event.pos):
+                        continue
+                    
+                    if self.current_state == GameState.SETTINGS:
+                        # Start dragging the volume slider
+                        if self.get_widgets(GameState.SETTINGS)["slider"].inflate(0, 20).collidepoint(event.pos):
+                            self.dragging_volume = True
+                            self.set_volume_from(event.pos[0])
+                    
+                    elif self.current_state == GameState.REPLAY:
+                        # Start scrubbing along the seek bar
+                        if self.get_widgets(GameState.REPLAY)["seek"].inflate(0, 20).collidepoint(event.pos):
+                            self.dragging_seek = True
+                            self.seek_replay_from(event.pos[0])
+                    
+                    elif self.current_state == GameState.NEW_GAME:
                         # Check if click is on the board
                         offset_x = (WIDTH - BOARD_SIZE) // 2
                         offset_y = (HEIGHT - BOARD_SIZE) // 2 - 50
                         
-                        mouse_pos = pygame.mouse.get_pos()
+                        mouse_pos = event.pos
                         if (offset_x <= mouse_pos[0] <= offset_x + BOARD_SIZE and
                             offset_y <= mouse_pos[1] <= offset_y + BOARD_SIZE):
                             # Calculate cell coordinates
@@ -1245,14 +1462,17 @@ class SudokuGame:
             
             elif event.type == pygame.KEYDOWN:
                 # Handle key presses
-                if self.current_state == GameState.NEW_GAME and self.active_cell:
+                if self.current_state == GameState.REPLAY:
+                    self.handle_replay_key(event.key)
+                
+                elif self.current_state == GameState.NEW_GAME and self.active_cell:
                     row, col = self.active_cell
                     
                     # Only allow input for empty cells or user-filled cells
                     if self.original_board[row][col] == 0:
                         if event.key == pygame.K_BACKSPACE or event.key == pygame.K_DELETE:
                             # Clear the cell
-                            self.board[row][col] = 0
+                            self.set_cell(row, col, 0)
                         
                         elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3,
                                           pygame.K_4, pygame.K_5, pygame.K_6,
@@ -1261,11 +1481,12 @@ class SudokuGame:
                             num = event.key - pygame.K_0
                             
                             # Place the number
-                            self.board[row][col] = num
+                            self.set_cell(row, col, num)
                             self.cell_status[row][col] = 1  # Mark as user input
                         
 
-                            if self.check_if_valid() and self.algo_solve_time !=0:
+                            # The player wins on a complete, conflict-free board they filled in themselves
+                            if self.conflicts.is_solved() and self.algo_solve_time == 0:
                                 # Get player name
                                 self.play_sound(self.solve_sound)
                                 player_name = self.input_player_name()
@@ -1281,30 +1502,15 @@ class SudokuGame:
 
     
     def restart_game(self):
+        # Only one pool thread may fill and save the pool file
+        self.puzzle_pool.stop()
         self = SudokuGame()
-        clock = pygame.time.Clock()
-        # self.current_state == GameState.NEW_GAME
         self.start_new_game()
-        while True:
-        # Handle events
-            self.handle_events()
-            # Draw the current screen
-            if self.current_state == GameState.WELCOME:
-                self.draw_welcome_screen()
-            elif self.current_state == GameState.NEW_GAME:
-                self.draw_game_screen()
-            elif self.current_state == GameState.SETTINGS:
-                self.draw_settings_screen()
-            elif self.current_state == GameState.HIGH_SCORES:
-                self.draw_high_scores_screen()
-            elif self.current_state == GameState.QUIT_CONFIRM:
-                self.draw_quit_confirm_screen()
-            elif self.current_state == GameState.ALGORITHM_SELECT:
-                self.draw_algorithm_select_screen()
-            clock.tick(60)
-            pygame.display.flip()
+        self.run()  # Continue in the main loop with the new game
 
     def go_to_main_menu(self):
+        # Only one pool thread may fill and save the pool file
+        self.puzzle_pool.stop()
         self = SudokuGame()
         self.run()  # Restart the game
     # def ask_play_again(self):
@@ -1354,6 +1560,9 @@ class SudokuGame:
     #     # Return the selection
     #     return selected_option == 0  # True if Yes, False if No
     def ask_play_again(self):
+        # This screen draws over the game screen
+        self.game_screen_valid = False
+        
         # Clear the screen
         self.screen.fill(self.current_colors["bg"])
 
@@ -1366,10 +1575,8 @@ class SudokuGame:
         yes_button = self.create_button("YES", WIDTH // 2 - 75, HEIGHT // 2 + 50, self.restart_game)  # Restart game function
         no_button = self.create_button("NO", WIDTH // 2 + 75, HEIGHT // 2 + 50, self.go_to_main_menu)  # Main menu function
 
-        # Handle button events and draw them
-        self.handle_button(yes_button)
+        # Draw the buttons, clicks are handled below
         self.draw_button(yes_button)
-        self.handle_button(no_button)
         self.draw_button(no_button)
 
         # Event loop for handling button clicks
@@ -1396,16 +1603,26 @@ class SudokuGame:
     def run(self):
         # Main game loop
         clock = pygame.time.Clock()
+        shown_state = None
         
         while True:
             # Handle events
-            self.handle_events()
+            if self.idle_rendering and self.current_state == shown_state:
+                # Sleep until there is something new to show
+                events = self.wait_for_events()
+                if not events and not self.animation_active() and not self.timer_changed():
+                    continue
+                self.handle_events(events)
+            else:
+                self.handle_events()
             
-            # Draw the current screen
+            # Draw the current screen, a button on it may switch to another screen
+            shown_state = self.current_state
+            dirty_rects = None
             if self.current_state == GameState.WELCOME:
                 self.draw_welcome_screen()
             elif self.current_state == GameState.NEW_GAME:
-                self.draw_game_screen()
+                dirty_rects = self.draw_game_screen()
             elif self.current_state == GameState.SETTINGS:
                 self.draw_settings_screen()
             elif self.current_state == GameState.HIGH_SCORES:
@@ -1414,50 +1631,160 @@ class SudokuGame:
                 self.draw_quit_confirm_screen()
             elif self.current_state == GameState.ALGORITHM_SELECT:
                 self.draw_algorithm_select_screen()
+            elif self.current_state == GameState.REPLAY:
+                self.draw_replay_screen()
             
-            # Update the display
-            pygame.display.flip()
+            # Update the display, only the changed parts of the game screen
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
             
             # Cap the frame rate
             clock.tick(60)
-
-    def solve_board_silently(self, board):
-        """Solve the board without visualization for when user presses Skip button"""
-        # Find an empty cell
-        empty = self.find_empty_in_board(board)
-        if not empty:
-            return True
-        
-        row, col = empty
-        
-        # Try numbers 1-9
-        for num in range(1, 10):
-            if self.is_valid_in_board(board, row, col, num):
-                board[row][col] = num
-                
-                # Recursively solve the rest
-                if self.solve_board_silently(board):
-                    return True
-                
-                # If not successful, backtrack
-                board[row][col] = 0
-        
-        return False
+    
+    def wait_for_events(self):
+        # Block until an event arrives or the timer is about to show a new second,
+        # then return every pending event (none after a timeout)
+        if self.animation_active():
+            return pygame.event.get()
+        
+        timeout = IDLE_WAIT_TIMEOUT
+        if self.current_state == GameState.NEW_GAME and self.start_time and not self.paused:
+            # Wake up right when the seconds digit changes
+            elapsed = self.elapsed_time + time.time() - self.start_time
+            timeout = min(timeout, int((1 - elapsed % 1) * 1000) + 1)
+        
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
+    def animation_active(self):
+        # A playing replay moves on every frame without any events
+        return self.current_state == GameState.REPLAY and self.replay_playing
+    
+    def timer_changed(self):
+        # Check whether the game timer would show a different second than on screen
+        if self.current_state != GameState.NEW_GAME or not self.start_time or self.paused:
+            return False
+        elapsed = self.elapsed_time + time.time() - self.start_time
+        return int(elapsed) != self.shown_seconds
 
     def draw_solving_controls(self):
-        """Draw the Stop and Skip buttons during solving visualization"""
-        # Create the solving control buttons at the bottom center of the screen
-        stop_button = self.create_button("STOP", WIDTH // 3, HEIGHT - 30, None)
-        skip_button = self.create_button("SKIP", WIDTH * 2 // 3, HEIGHT - 30, None)
+        """Draw the Stop, Turbo and Skip buttons during solving visualization"""
+        # The solving control buttons sit at the bottom center of the screen
+        widgets = self.get_widgets("solving")
         
         # Draw the buttons
-        self.draw_button(stop_button)
-        self.draw_button(skip_button)
+        for button in widgets["buttons"]:
+            self.draw_button(button)
         
-        # Store button rectangles for event processing
-        self.stop_button_rect = stop_button["rect"]
-        self.skip_button_rect = skip_button["rect"]
+        # Show the turbo multiplier next to the buttons, rendered again only when it changes
+        turbo_label = f"x{self.solver_turbo}"
+        if widgets["turbo_label"] != turbo_label:
+            widgets["turbo_label"] = turbo_label
+            widgets["turbo_text"] = self.small_font.render(turbo_label, True, self.current_colors["text"])
+        self.screen.blit(widgets["turbo_text"], widgets["turbo_text"].get_rect(midleft=(WIDTH * 5 // 6 - 20, HEIGHT - 30)))
+    
+    def cycle_solver_turbo(self):
+        # Step through the turbo multipliers, wrapping back to normal speed
+        level = SOLVER_TURBO_LEVELS.index(self.solver_turbo)
+        self.solver_turbo = SOLVER_TURBO_LEVELS[(level + 1) % len(SOLVER_TURBO_LEVELS)]
+    
+    def change_solver_turbo(self, change):
+        # Move the turbo multiplier up or down one level
+        level = SOLVER_TURBO_LEVELS.index(self.solver_turbo) + change
+        self.solver_turbo = SOLVER_TURBO_LEVELS[max(0, min(len(SOLVER_TURBO_LEVELS) - 1, level))]
+    
+    def request_stop_solving(self):
+        # Stop the visualization and leave the board as it is
+        self.stop_solving = True
+    
+    def request_skip_solving(self):
+        # Finish the search without drawing and show the solution
+        self.skip_to_solution = True
 
+    def play_solver_steps(self, steps):
+        """Show a solver's step events at the target rate times the turbo multiplier, one frame per tick"""
+        clock = pygame.time.Clock()
+        
+        # Reset solving control flags
+        self.stop_solving = False
+        self.skip_to_solution = False
+        
+        self.board = [row[:] for row in self.solve_start]
+        self.conflicts.load(self.board)
+        
+        # Time the search itself, the pacing and drawing in between are left out
+        self.algo_search_time = 0.0
+        steps = self.time_steps(steps)
+        
+        # Keep every step so the search can be replayed without running it again
+        if self.record_trace:
+            self.trace = SolverTrace(self.solve_start)
+            steps = self.trace.record(steps)
+        
+        # Steps come due with the time played, so the turbo multiplier applies from the next frame
+        steps = iter(steps)
+        due = 0.0
+        last_time = time.perf_counter()
+        finished = False
+        while not finished:
+            now = time.perf_counter()
+            due += (now - last_time) * SOLVER_STEPS_PER_SECOND * self.solver_turbo
+            last_time = now
+            deadline = now + 1 / SOLVER_FPS
+            
+            # Run the search at full speed up to the steps due, only the board is updated
+            taken = 0
+            while due >= 1:
+                step = next(steps, None)
+                if step is None:
+                    finished = True
+                    break
+                index, num, action = step
+                self.board[index // 9][index % 9] = 0 if action == STEP_UNDO else num
+                self.active_cell = divmod(index, 9)
+                due -= 1
+                
+                # When the search can't keep up, drop the backlog rather than the frame rate
+                taken += 1
+                if taken % 256 == 0 and time.perf_counter() > deadline:
+                    due = 0.0
+                    break
+            
+            # Render the board as it is now, once per frame
+            self.conflicts.load(self.board)
+            dirty_rects = self.draw_game_screen()
+            self.draw_solving_controls()
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
+            
+            # Process events to check for stop/skip button presses
+            self.process_solving_events()
+            if self.stop_solving:
+                return
+            if self.skip_to_solution:
+                # Let the search finish at full speed without drawing
+                for _ in steps:
+                    pass
+                return
+            clock.tick(SOLVER_FPS)
+    
+    def time_steps(self, steps):
+        # Pass the solver's steps through, adding the time spent computing each one to the search time
+        steps = iter(steps)
+        while True:
+            start = time.perf_counter()
+            step = next(steps, None)
+            self.algo_search_time += time.perf_counter() - start
+            if step is None:
+                return
+            yield step
+    
     def process_solving_events(self):
         """Process events during solving visualization to check for Stop/Skip button clicks"""
         for event in pygame.event.get():
@@ -1466,20 +1793,18 @@ class SudokuGame:
                 pygame.quit()
                 sys.exit()
             
+            elif event.type == pygame.MOUSEMOTION:
+                self.update_hover(event.pos)
+            
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
-                    mouse_pos = pygame.mouse.get_pos()
-                    
-                    # Check if Stop button was clicked
-                    if hasattr(self, 'stop_button_rect') and self.stop_button_rect.collidepoint(mouse_pos):
-                        self.play_sound(self.button_sound)
-                        self.stop_solving = True
-                        return
-                    
-                    # Check if Skip button was clicked
-                    if hasattr(self, 'skip_button_rect') and self.skip_button_rect.collidepoint(mouse_pos):
-                        self.play_sound(self.button_sound)
-                        self.skip_to_solution = True
+                    self.press_widget(self.get_widgets("solving"), event.pos)
+            
+            elif event.type == pygame.MOUSEBUTTONUP:
+                # Stop or Skip fire when released over the button
+                if event.button == 1:
+                    self.release_widget(self.get_widgets("solving"), event.pos)
+                    if self.stop_solving or self.skip_to_solution:
                         return
             
             elif event.type == pygame.KEYDOWN:
@@ -1488,6 +1813,12 @@ class SudokuGame:
                     self.stop_solving = True
                     return
                 
+                # Change the turbo multiplier with Up/Down or +/-
+                if event.key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.change_solver_turbo(1)
+                elif event.key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.change_solver_turbo(-1)
+                
                 # Skip to solution with Space key
                 if event.key == pygame.K_SPACE:
                     self.skip_to_solution = True
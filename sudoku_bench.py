@@ -0,0 +1,142 @@
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+
+from sudoku_core import ALGORITHMS, SolverStats, solve_with_stats, board_from_string
+from sudoku_cli import read_puzzles
+
+# Solver benchmark: runs every algorithm over the bundled puzzle corpora and reports
+# the distribution of solve time and of every SolverStats counter per puzzle. The JSON output
+# has a stable layout so runs from two versions can be diffed or passed to --compare
+
+CORPUS_DIR = 'data/corpora'
+CORPORA = ("easy", "medium", "hard", "17clue", "hardest")
+
+# Plain backtracking can take minutes on the hardest puzzles, it is cut off after this
+MAX_SECONDS = 10.0
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of sorted values
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def summarize(values):
+    # Distribution of one measurement over a corpus
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        "min": values[0],
+        "median": statistics.median(values),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": values[-1],
+        "mean": statistics.fmean(values)
+    }
+
+def run_corpus(path, algorithm, max_seconds):
+    # Solve every puzzle of a corpus file, returning its summary
+    times = []
+    counters = {name: [] for name in SolverStats.__slots__}
+    timeouts = unsolved = 0
+    with open(path, 'r') as f:
+        for line_number, puzzle in read_puzzles(f):
+            board = board_from_string(puzzle)
+            start_time = time.perf_counter()
+            solution, stats = solve_with_stats(board, algorithm, max_seconds)
+            elapsed = time.perf_counter() - start_time
+            if solution is None:
+                # An unfinished backtracking search only counts as a timeout
+                if algorithm == "backtracking" and elapsed >= max_seconds:
+                    timeouts += 1
+                else:
+                    unsolved += 1
+                continue
+            times.append(elapsed)
+            for name, value in stats.as_dict().items():
+                counters[name].append(value)
+    
+    result = {
+        "puzzles": len(times) + timeouts + unsolved,
+        "timeouts": timeouts,
+        "unsolved": unsolved,
+        "time": summarize(times)
+    }
+    for name, values in counters.items():
+        result[name] = summarize(values)
+    return result
+
+def print_table(results):
+    # Human-readable summary, times in milliseconds
+    print(f"{'algorithm':<13}{'corpus':<9}{'n':>4}{'t/o':>4}  "
+          f"{'time ms: min':>12}{'median':>9}{'p95':>9}{'p99':>9}{'max':>9}  "
+          f"{'nodes: median':>14}{'max':>12}  {'guesses: median':>16}{'max':>12}")
+    for algorithm, corpora in results.items():
+        for corpus, result in corpora.items():
+            row = f"{algorithm:<13}{corpus:<9}{result['puzzles']:>4}{result['timeouts']:>4}  "
+            if result["time"] is None:
+                print(row + "no puzzle solved")
+                continue
+            t, n, g = result["time"], result["nodes"], result["guesses"]
+            row += "".join(f"{t[key] * 1000:>9.3f}" for key in ("min", "median", "p95", "p99", "max")).rjust(48)
+            row += f"  {n['median']:>14.0f}{n['max']:>12}  {g['median']:>16.0f}{g['max']:>12}"
+            if result["unsolved"]:
+                row += f"  ({result['unsolved']} unsolved)"
+            print(row)
+
+def print_comparison(results, baseline):
+    # Ratios of this run's medians to a previous run's, below 1 is faster or smaller
+    print(f"\nCompared to baseline (ratio of medians):")
+    print(f"{'algorithm':<13}{'corpus':<9}{'time':>8}{'nodes':>8}{'guesses':>9}")
+    for algorithm, corpora in results.items():
+        for corpus, result in corpora.items():
+            old = baseline.get("results", {}).get(algorithm, {}).get(corpus)
+            if old is None or old["time"] is None or result["time"] is None:
+                continue
+            ratios = []
+            for key in ("time", "nodes", "guesses"):
+                before, after = old[key]["median"], result[key]["median"]
+                ratios.append(f"{after / before:.2f}" if before else "-")
+            print(f"{algorithm:<13}{corpus:<9}{ratios[0]:>8}{ratios[1]:>8}{ratios[2]:>9}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku solvers over the bundled puzzle corpora.")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS),
+                        help="algorithms to run (default: all)")
+    parser.add_argument("-c", "--corpora", nargs="+", choices=CORPORA, default=list(CORPORA),
+                        help="corpora to run (default: all)")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS,
+                        help=f"cut-off per puzzle for backtracking (default: {MAX_SECONDS:g})")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+    
+    results = {}
+    for algorithm in args.algorithms:
+        results[algorithm] = {}
+        for corpus in args.corpora:
+            results[algorithm][corpus] = run_corpus(os.path.join(CORPUS_DIR, corpus + ".txt"),
+                                                    algorithm, args.max_seconds)
+    print_table(results)
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            print_comparison(results, json.load(f))
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                "format": 1,
+                "python": platform.python_version(),
+                "max_seconds": args.max_seconds,
+                "results": results
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from sudoku_core import (ALGORITHMS, SOLUTION_CACHE_FILE, SolutionCache, solve_board,
+                         board_to_string, board_from_string)
+
+# Batch solver: reads puzzles one per line in the common 81-character format
+# (digits, with 0 or '.' for empty cells) and writes one result line per puzzle:
+# input line number, solution (or "unsolvable") and solve time in seconds, tab separated.
+# Anything after the first 81 characters (a comma, a rating, a solution) is ignored
+
+# Puzzles per work unit sent to a worker process, and work units in flight per worker
+CHUNK_SIZE = 64
+CHUNKS_PER_WORKER = 4
+
+# Solution cache of a worker process, loaded by init_worker
+worker_cache = None
+
+def parse_puzzle(line):
+    # Normalize one input line to 81 digits, None when it is not a puzzle
+    text = line.strip().replace('.', '0')[:81]
+    if len(text) != 81 or not (text.isascii() and text.isdigit()):
+        return None
+    return text
+
+def read_puzzles(stream):
+    # Yield (line number, puzzle) for every puzzle, reporting malformed lines on stderr.
+    # Blank lines and lines starting with '#' are skipped silently
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip() or line.startswith('#'):
+            continue
+        puzzle = parse_puzzle(line)
+        if puzzle is None:
+            print(f"line {line_number}: skipped malformed puzzle", file=sys.stderr)
+            continue
+        yield line_number, puzzle
+
+def read_chunks(puzzles, size):
+    # Group puzzles into lists of up to 'size'
+    chunk = []
+    for item in puzzles:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def solve_line(line_number, puzzle, algorithm, cache=None):
+    # Solve one puzzle and format its result line, looking it up in the solution cache first
+    # when there is one. Returns the line, whether it was solved, the time taken, whether
+    # the cache answered it and the cache entry for it
+    start_time = time.perf_counter()
+    board = board_from_string(puzzle)
+    cached = False
+    entry = None
+    if cache is None:
+        solution = solve_board(board, algorithm)
+    else:
+        hits = cache.hits
+        solution, entry = cache.solve(board, algorithm)
+        cached = cache.hits > hits
+    elapsed = time.perf_counter() - start_time
+    result = board_to_string(solution) if solution is not None else "unsolvable"
+    return f"{line_number}\t{result}\t{elapsed:.6f}", solution is not None, elapsed, cached, entry
+
+def init_worker(cache_path):
+    # Give a worker process its own copy of the solution cache, the entries it uses
+    # are sent back with its results so the parent's cache learns them
+    global worker_cache
+    worker_cache = SolutionCache(cache_path) if cache_path is not None else None
+
+def solve_chunk(chunk, algorithm):
+    # Solve a work unit in a worker process, returning the worker's pid with the results
+    return os.getpid(), [solve_line(line_number, puzzle, algorithm, worker_cache) for line_number, puzzle in chunk]
+
+class BatchStats:
+    """Counts and solve times of a batch run, in total and per worker process"""
+
+    def __init__(self):
+        self.solved = 0
+        self.unsolvable = 0
+        self.solve_time = 0.0
+        self.cached = 0
+        self.workers = {}  # pid -> [puzzles, seconds spent solving]
+
+    def emit(self, pid, results, out, cache=None):
+        # Write a chunk's result lines and count them, their cache entries go into 'cache'
+        worker = self.workers.setdefault(pid, [0, 0.0])
+        for line, ok, elapsed, cached, entry in results:
+            out.write(line + "\n")
+            if ok:
+                self.solved += 1
+            else:
+                self.unsolvable += 1
+            if cached:
+                self.cached += 1
+            if cache is not None and entry is not None:
+                cache.put(*entry)
+            self.solve_time += elapsed
+            worker[0] += 1
+            worker[1] += elapsed
+
+    def report(self, wall_time):
+        # Summary on stderr so stdout stays one line per puzzle
+        total = self.solved + self.unsolvable
+        print(f"{total} puzzles ({self.solved} solved, {self.unsolvable} unsolvable) in {wall_time:.3f}s, "
+              f"{total / wall_time if wall_time else 0:.1f} puzzles/s, "
+              f"{self.solve_time / total if total else 0:.6f}s average solve time", file=sys.stderr)
+        if self.cached:
+            print(f"  {self.cached} answered from the solution cache", file=sys.stderr)
+        if len(self.workers) > 1:
+            for number, (pid, (count, seconds)) in enumerate(sorted(self.workers.items()), 1):
+                print(f"  worker {number} (pid {pid}): {count} puzzles, "
+                      f"{count / seconds if seconds else 0:.1f} puzzles/s", file=sys.stderr)
+
+def solve_serial(puzzles, algorithm, stats, out, cache=None):
+    # Solve in this process, writing results as they are solved
+    pid = os.getpid()
+    for line_number, puzzle in puzzles:
+        stats.emit(pid, [solve_line(line_number, puzzle, algorithm, cache)], out)
+
+def solve_parallel(puzzles, algorithm, stats, out, workers, chunk_size, order, cache=None):
+    # Shard the puzzles over a process pool in chunks. Only a few chunks per worker are in
+    # flight at a time, so memory stays bounded however long the input is. Each worker
+    # starts from the saved solution cache, new entries are merged into 'cache' here
+    limit = workers * CHUNKS_PER_WORKER
+    cache_path = cache.path if cache is not None else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(cache_path,)) as executor:
+        if order == "input":
+            # Results come out in the order the chunks were read
+            pending = deque()
+            for chunk in read_chunks(puzzles, chunk_size):
+                pending.append(executor.submit(solve_chunk, chunk, algorithm))
+                if len(pending) >= limit:
+                    stats.emit(*pending.popleft().result(), out, cache)
+            while pending:
+                stats.emit(*pending.popleft().result(), out, cache)
+        else:
+            # Results come out as soon as any chunk is done
+            pending = set()
+            for chunk in read_chunks(puzzles, chunk_size):
+                pending.add(executor.submit(solve_chunk, chunk, algorithm))
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stats.emit(*future.result(), out, cache)
+            for future in wait(pending).done:
+                stats.emit(*future.result(), out, cache)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve Sudoku puzzles in bulk, one 81-character puzzle per line.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="file with one puzzle per line, '-' or nothing for stdin")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="constraint",
+                        help="solving algorithm (default: constraint)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes, 0 for one per CPU (default: 1, solve in this process)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"puzzles per work unit sent to a worker (default: {CHUNK_SIZE})")
+    parser.add_argument("--order", choices=("input", "completion"), default="input",
+                        help="write results in input order or as they complete (default: input)")
+    parser.add_argument("--cache", nargs="?", const=SOLUTION_CACHE_FILE, metavar="PATH",
+                        help="answer puzzles seen before, in any symmetric form, from a solution cache "
+                             f"kept in PATH (default: {SOLUTION_CACHE_FILE})")
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    if workers < 0 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be positive")
+    
+    # Undecodable bytes become replacement characters, so their line is reported as malformed
+    if args.input == "-":
+        stream = sys.stdin
+        stream.reconfigure(errors='replace')
+    else:
+        try:
+            stream = open(args.input, 'r', errors='replace')
+        except OSError as e:
+            parser.error(f"can't open {args.input}: {e.strerror}")
+    cache = SolutionCache(args.cache) if args.cache else None
+    stats = BatchStats()
+    start_time = time.perf_counter()
+    try:
+        # Results are written as the puzzles are read, nothing is kept in memory
+        puzzles = read_puzzles(stream)
+        if workers == 1:
+            solve_serial(puzzles, args.algorithm, stats, sys.stdout, cache)
+        else:
+            solve_parallel(puzzles, args.algorithm, stats, sys.stdout, workers, args.chunk_size, args.order, cache)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if cache is not None and cache.dirty:
+            cache.save()
+    
+    stats.report(time.perf_counter() - start_time)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1607 @@
+import time
+import random
+import json
+import os
+import threading
+from collections import deque, OrderedDict
+from itertools import chain, combinations, permutations
+from enum import Enum
+
+# Board, solver and puzzle generation logic shared by the game and headless tools.
+# Nothing in this module imports pygame
+
+# Number of solved boards the generator tries to carve a puzzle of the right rating from
+GENERATE_ATTEMPTS = 20
+
+# Puzzle generation modes
+class GenerationMode(Enum):
+    SEARCH = "Search"
+    TRANSFORM = "Transform"
+
+# Known-good puzzles the transform generator starts from
+SEED_FILE = 'data/seed_puzzles.json'
+
+# Ready puzzles kept per difficulty
+POOL_SIZE = 10
+POOL_FILE = 'data/puzzle_pool.json'
+POOL_REFILL_DELAY = 0.5
+
+# Difficulty levels
+# 'levels' is the range of the hardest technique a puzzle may need (see Technique)
+class Difficulty(Enum):
+    EASY = {"name": "Easy", "empty_cells": 30, "levels": (1, 1)}
+    MEDIUM = {"name": "Medium", "empty_cells": 45, "levels": (2, 3)}
+    HARD = {"name": "Hard", "empty_cells": 55, "levels": (4, 7)}
+
+# Bitmask board engine
+# Cells are indexed 0-80 row by row, bit (num - 1) of a mask is set when num is used
+ALL_DIGITS = 0x1FF
+CELL_BOX = [(index // 27) * 3 + (index % 9) // 3 for index in range(81)]
+MASK_DIGITS = [tuple(num for num in range(1, 10) if mask & (1 << (num - 1))) for mask in range(512)]
+MASK_SIZE = [len(nums) for nums in MASK_DIGITS]
+
+class BitBoard:
+    """Flat board that keeps row, column and box occupancy masks in sync with its cells"""
+    __slots__ = ("cells", "row_masks", "col_masks", "box_masks")
+
+    def __init__(self, board=None):
+        self.cells = [0] * 81
+        self.row_masks = [0] * 9
+        self.col_masks = [0] * 9
+        self.box_masks = [0] * 9
+
+        # Load the filled cells of a nested 9x9 board
+        if board is not None:
+            for i in range(9):
+                for j in range(9):
+                    if board[i][j] != 0:
+                        self.place(i * 9 + j, board[i][j])
+
+    def place(self, index, num):
+        # Put 'num' in the cell and mark it as used in its row, column and box
+        bit = 1 << (num - 1)
+        self.cells[index] = num
+        self.row_masks[index // 9] |= bit
+        self.col_masks[index % 9] |= bit
+        self.box_masks[CELL_BOX[index]] |= bit
+
+    def unplace(self, index):
+        # Empty the cell and release its number in its row, column and box
+        keep = ~(1 << (self.cells[index] - 1))
+        self.cells[index] = 0
+        self.row_masks[index // 9] &= keep
+        self.col_masks[index % 9] &= keep
+        self.box_masks[CELL_BOX[index]] &= keep
+
+    def used(self, index):
+        # Mask of the numbers already used by the cell's row, column and box
+        return self.row_masks[index // 9] | self.col_masks[index % 9] | self.box_masks[CELL_BOX[index]]
+
+    def is_valid(self, index, num):
+        # Check if placing 'num' in the cell is valid
+        return not self.used(index) & (1 << (num - 1))
+
+    def candidates(self, index):
+        # Mask of the numbers that can still go in the cell
+        return ALL_DIGITS & ~self.used(index)
+
+    def find_empty(self, start=0):
+        # Find the first empty cell at or after 'start'
+        cells = self.cells
+        for index in range(start, 81):
+            if cells[index] == 0:
+                return index
+        return None
+
+    def solve(self, start=0, shuffle=False):
+        # Solve the board using backtracking, resuming the empty cell scan where the caller left off
+        index = self.find_empty(start)
+        if index is None:
+            return True
+
+        nums = MASK_DIGITS[self.candidates(index)]
+        if shuffle:
+            # Shuffle numbers for more randomness
+            nums = list(nums)
+            random.shuffle(nums)
+
+        for num in nums:
+            self.place(index, num)
+            if self.solve(index + 1, shuffle):
+                return True
+            self.unplace(index)
+
+        return False
+
+    def to_board(self):
+        # Convert to a nested 9x9 board
+        return [self.cells[i * 9:i * 9 + 9] for i in range(9)]
+
+    def write_to(self, board):
+        # Copy the cells into an existing nested 9x9 board
+        for i in range(9):
+            board[i][:] = self.cells[i * 9:i * 9 + 9]
+
+# Iterative solver status
+class SolverStatus(Enum):
+    RUNNING = 0
+    PAUSED = 1
+    SOLVED = 2
+    UNSOLVABLE = 3
+
+# Solver step events are (cell index, number, action) tuples
+STEP_PLACE = 0
+STEP_UNDO = 1
+STEP_PROPAGATE = 2  # A number placed because propagation forced it, not guessed
+
+class SolverStats:
+    """Work counters of one search, comparable across the solvers"""
+    __slots__ = ("nodes", "guesses", "checks", "backtracks", "eliminations", "max_depth")
+
+    def __init__(self, nodes=0, guesses=0, checks=0, backtracks=0, eliminations=0, max_depth=0):
+        self.nodes = nodes                # Placements or rows selected by the search
+        self.guesses = guesses            # Of those, the ones made where more than one option was open
+        self.checks = checks              # Validity checks: candidate sets computed, placements tested or columns covered
+        self.backtracks = backtracks      # Placements taken back after they led to a dead end
+        self.eliminations = eliminations  # Candidates removed by propagation or by covering columns
+        self.max_depth = max_depth        # Deepest level the search stack reached
+
+    def as_dict(self):
+        # The counters by name, in the order of __slots__
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class IterativeSolver:
+    """Backtracking solver with an explicit search stack that can be advanced a few nodes at a time"""
+
+    def __init__(self, board, shuffle=False, record_steps=False):
+        self.engine = BitBoard(board)
+        self.shuffle = shuffle
+        self.status = SolverStatus.RUNNING
+        self.nodes = 0
+        self.guesses = 0  # Numbers tried in cells that had more than one candidate
+        self.checks = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        
+        # Step events since they were last collected, None when not recording
+        self.steps = [] if record_steps else None
+
+        # Each frame is [cell index, numbers to try, position of the next number]
+        self.stack = []
+        self.next_start = 0
+        self.descend = True
+
+    def advance(self, max_nodes=1):
+        # Expand up to 'max_nodes' search nodes and return the status afterwards
+        if self.status != SolverStatus.RUNNING:
+            return self.status
+
+        engine, stack, steps = self.engine, self.stack, self.steps
+        expanded = 0
+        guesses = checks = backtracks = 0
+        while expanded < max_nodes:
+            # Open a frame for the next empty cell
+            if self.descend:
+                index = engine.find_empty(self.next_start)
+                if index is None:
+                    self.status = SolverStatus.SOLVED
+                    break
+                nums = MASK_DIGITS[engine.candidates(index)]
+                checks += 1
+                if self.shuffle:
+                    nums = list(nums)
+                    random.shuffle(nums)
+                stack.append([index, nums, 0])
+                if len(stack) > self.max_depth:
+                    self.max_depth = len(stack)
+                self.descend = False
+
+            # Undo the previous number of the top frame and try its next one
+            frame = stack[-1]
+            index, nums, position = frame
+            if position:
+                engine.unplace(index)
+                backtracks += 1
+                if steps is not None:
+                    steps.append((index, nums[position - 1], STEP_UNDO))
+            if position < len(nums):
+                engine.place(index, nums[position])
+                if steps is not None:
+                    steps.append((index, nums[position], STEP_PLACE))
+                frame[2] = position + 1
+                expanded += 1
+                if len(nums) > 1:
+                    guesses += 1
+                self.next_start = index + 1
+                self.descend = True
+            else:
+                # Every number failed, backtrack to the previous cell
+                stack.pop()
+                if not stack:
+                    self.status = SolverStatus.UNSOLVABLE
+                    break
+
+        self.nodes += expanded
+        self.guesses += guesses
+        self.checks += checks
+        self.backtracks += backtracks
+        return self.status
+
+    def run(self, max_nodes=None, max_seconds=None, batch=256):
+        # Advance until the search ends or this call's node or wall-clock budget is spent,
+        # a search stopped by a budget stays RUNNING and can be continued with another call
+        deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+        start_nodes = self.nodes
+        while self.status == SolverStatus.RUNNING:
+            step = batch
+            if max_nodes is not None:
+                step = min(step, max_nodes - (self.nodes - start_nodes))
+                if step <= 0:
+                    break
+            self.advance(step)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return self.status
+
+    def iter_steps(self, batch=64):
+        # Run the search, yielding the step events recorded along the way
+        if self.steps is None:
+            self.steps = []
+        while True:
+            status = self.advance(batch)
+            steps, self.steps = self.steps, []
+            yield from steps
+            if status != SolverStatus.RUNNING:
+                return
+
+    def pause(self):
+        # Suspend the search, advance() does nothing until resume()
+        if self.status == SolverStatus.RUNNING:
+            self.status = SolverStatus.PAUSED
+
+    def resume(self):
+        # Continue a paused search where it stopped
+        if self.status == SolverStatus.PAUSED:
+            self.status = SolverStatus.RUNNING
+
+    def stats(self):
+        # Snapshot of the work counters, plain backtracking eliminates no candidates
+        return SolverStats(self.nodes, self.guesses, self.checks, self.backtracks, 0, self.max_depth)
+
+    def to_board(self):
+        # Convert the current search state to a nested 9x9 board
+        return self.engine.to_board()
+
+# Constraint propagation
+# The 27 units (rows, columns, boxes) and the 20 peers of every cell
+UNITS = ([[row * 9 + col for col in range(9)] for row in range(9)] +
+         [[row * 9 + col for row in range(9)] for col in range(9)] +
+         [[index for index in range(81) if CELL_BOX[index] == box] for box in range(9)])
+CELL_PEERS = [tuple(sorted({peer for unit in UNITS if index in unit for peer in unit} - {index}))
+              for index in range(81)]
+
+class CandidateGrid:
+    """Candidate masks for every cell, propagated to a fixpoint with naked and hidden singles"""
+    __slots__ = ("cells", "candidates", "consistent")
+
+    def __init__(self, board=None):
+        self.cells = [0] * 81
+        self.candidates = [ALL_DIGITS] * 81
+        self.consistent = True
+
+        # Assign the filled cells of a nested 9x9 board
+        if board is not None:
+            givens = [(i * 9 + j, board[i][j]) for i in range(9) for j in range(9) if board[i][j] != 0]
+            self.consistent = self.assign_all(givens)
+
+    def copy(self):
+        # Copy the grid so a guess can be undone by dropping the copy
+        grid = CandidateGrid.__new__(CandidateGrid)
+        grid.cells = self.cells[:]
+        grid.candidates = self.candidates[:]
+        grid.consistent = self.consistent
+        return grid
+
+    def assign(self, index, num):
+        # Place 'num' and propagate, returns False if that leads to a contradiction
+        return self.assign_all([(index, num)])
+
+    def assign_all(self, queue):
+        # Place every (index, num) in the queue and run propagation to a fixpoint
+        cells, candidates = self.cells, self.candidates
+        while queue:
+            # Naked singles: place queued numbers and remove them from the peers
+            while queue:
+                index, num = queue.pop()
+                if cells[index] == num:
+                    continue
+                bit = 1 << (num - 1)
+                if cells[index] != 0 or not candidates[index] & bit:
+                    self.consistent = False
+                    return False
+                cells[index] = num
+                candidates[index] = bit
+                for peer in CELL_PEERS[index]:
+                    mask = candidates[peer]
+                    if mask & bit:
+                        if cells[peer] != 0:
+                            self.consistent = False
+                            return False
+                        mask &= ~bit
+                        candidates[peer] = mask
+                        if mask == 0:
+                            self.consistent = False
+                            return False
+                        if mask & (mask - 1) == 0:
+                            queue.append((peer, MASK_DIGITS[mask][0]))
+
+            # Hidden singles: a number with only one place left in a unit
+            for unit in UNITS:
+                once = twice = placed = 0
+                for index in unit:
+                    mask = candidates[index]
+                    if cells[index] != 0:
+                        placed |= mask
+                    else:
+                        twice |= once & mask
+                        once |= mask
+                if (once | placed) != ALL_DIGITS:
+                    self.consistent = False
+                    return False
+                hidden = once & ~twice & ~placed
+                if hidden:
+                    for index in unit:
+                        if cells[index] == 0 and candidates[index] & hidden:
+                            queue.append((index, MASK_DIGITS[candidates[index] & hidden][0]))
+        return True
+
+    def find_min_cell(self):
+        # Find the empty cell with the fewest candidates, None when the grid is full
+        best = None
+        best_count = 10
+        cells, candidates = self.cells, self.candidates
+        for index in range(81):
+            if cells[index] == 0:
+                count = len(MASK_DIGITS[candidates[index]])
+                if count < best_count:
+                    best, best_count = index, count
+                    if count == 2:
+                        break
+        return best
+
+    def count_candidates(self):
+        # Total candidates left over all cells, placed cells count their one number
+        return sum(map(MASK_SIZE.__getitem__, self.candidates))
+
+    def count_solutions(self, limit=2):
+        # Count the solutions reachable from this grid, stopping once 'limit' have been found
+        if not self.consistent:
+            return 0
+        index = self.find_min_cell()
+        if index is None:
+            return 1
+
+        count = 0
+        for value in MASK_DIGITS[self.candidates[index]]:
+            child = self.copy()
+            if child.assign(index, value):
+                count += child.count_solutions(limit - count)
+                if count >= limit:
+                    break
+        return count
+
+    def to_board(self):
+        # Convert to a nested 9x9 board
+        return [self.cells[i * 9:i * 9 + 9] for i in range(9)]
+
+class PropagationSolver:
+    """Search over a CandidateGrid that only guesses when propagation stalls"""
+
+    def __init__(self, board):
+        self.givens = [board[i][j] for i in range(9) for j in range(9)]
+        self.grid = CandidateGrid(board)
+        self.nodes = 0
+        self.guesses = 0
+        self.solution = None
+
+        # Propagating the givens counts as the first checks and eliminations
+        self.checks = sum(1 for num in self.grid.cells if num != 0)
+        self.backtracks = 0
+        self.eliminations = 81 * 9 - self.grid.count_candidates()
+        self.max_depth = 0
+
+    def solve(self):
+        # Run the search to the end without looking at the steps
+        for _ in self.iter_steps():
+            pass
+        return self.solution is not None
+
+    def iter_steps(self):
+        # Run the search, yielding a step event for every number placed or taken back
+        if not self.grid.consistent:
+            return
+
+        # Numbers forced by the givens alone
+        for index in range(81):
+            if self.grid.cells[index] != self.givens[index]:
+                yield (index, self.grid.cells[index], STEP_PROPAGATE)
+
+        yield from self.search(self.grid)
+
+    def search(self, grid, depth=1):
+        # If no more empty cells, puzzle is solved
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        index = grid.find_min_cell()
+        if index is None:
+            self.solution = grid
+            return
+
+        # Try each possible value on a copy so a wrong guess is undone by dropping it
+        empty = grid.cells.count(0)
+        remaining = grid.count_candidates()
+        for value in MASK_DIGITS[grid.candidates[index]]:
+            self.guesses += 1
+            child = grid.copy()
+            consistent = child.assign(index, value)
+
+            # Every newly filled cell passed a placement check, a contradiction fails one more
+            filled = empty - child.cells.count(0)
+            self.checks += filled if consistent else filled + 1
+            self.eliminations += remaining - child.count_candidates()
+            if not consistent:
+                self.backtracks += 1
+                continue
+
+            # The guessed cell comes first, then the cells propagation filled in
+            placed = [index] + [i for i in range(81) if i != index and child.cells[i] != grid.cells[i]]
+            yield (index, value, STEP_PLACE)
+            for i in placed[1:]:
+                yield (i, child.cells[i], STEP_PROPAGATE)
+
+            yield from self.search(child, depth + 1)
+            if self.solution is not None:
+                return
+
+            self.backtracks += 1
+            for i in reversed(placed):
+                yield (i, child.cells[i], STEP_UNDO)
+
+    def stats(self):
+        # Snapshot of the work counters
+        return SolverStats(self.nodes, self.guesses, self.checks, self.backtracks,
+                           self.eliminations, self.max_depth)
+
+# Solver traces
+# A trace file is the magic bytes, the 81 givens, then two bytes per step event:
+# the cell index and (action << 4 | number)
+TRACE_MAGIC = b"SDKT\x01"
+TRACE_KEYFRAME_INTERVAL = 1024
+
+class SolverTrace:
+    """Compact log of a solver's step events that can be saved and replayed"""
+
+    __slots__ = ("givens", "events")
+
+    def __init__(self, board):
+        self.givens = bytes(FlatBoard.from_nested(board).cells)
+        self.events = bytearray()
+
+    def __len__(self):
+        return len(self.events) // 2
+
+    def append(self, index, num, action):
+        self.events.append(index)
+        self.events.append(action << 4 | num)
+
+    def record(self, steps):
+        # Pass step events through, keeping each one in the log
+        events = self.events
+        for step in steps:
+            index, num, action = step
+            events.append(index)
+            events.append(action << 4 | num)
+            yield step
+
+    def event(self, position):
+        # Decode one step event as (cell index, number, action)
+        code = self.events[2 * position + 1]
+        return self.events[2 * position], code & 15, code >> 4
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(TRACE_MAGIC)
+            f.write(self.givens)
+            f.write(self.events)
+
+    @classmethod
+    def load(cls, path):
+        # Read a trace file, raising ValueError when it is not one
+        with open(path, 'rb') as f:
+            data = f.read()
+        header = len(TRACE_MAGIC) + 81
+        if not data.startswith(TRACE_MAGIC) or len(data) < header or (len(data) - header) % 2:
+            raise ValueError(f"{path} is not a solver trace")
+        trace = cls([[0] * 9 for _ in range(9)])
+        trace.givens = data[len(TRACE_MAGIC):header]
+        trace.events = bytearray(data[header:])
+        return trace
+
+    def matches(self, board):
+        # Check whether the trace was recorded for a puzzle, possibly starting from
+        # a board where the player had already filled in some of its empty cells
+        return all(num == 0 or given == num
+                   for given, num in zip(self.givens, (board[i][j] for i in range(9) for j in range(9))))
+
+class TracePlayer:
+    """Position in a SolverTrace that can be moved forward, backward or to any step"""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.cells = bytearray(trace.givens)
+        self.position = 0
+        self.last_index = None
+
+        # Snapshots of the board every TRACE_KEYFRAME_INTERVAL steps make long seeks cheap
+        self.keyframes = [bytes(self.cells)]
+        for position in range(len(trace)):
+            self.step_forward()
+            if self.position % TRACE_KEYFRAME_INTERVAL == 0:
+                self.keyframes.append(bytes(self.cells))
+        self.seek(0)
+
+    def __len__(self):
+        return len(self.trace)
+
+    def step_forward(self):
+        # Apply the next event, every event removes the number it names or places it
+        index, num, action = self.trace.event(self.position)
+        self.cells[index] = 0 if action == STEP_UNDO else num
+        self.position += 1
+        self.last_index = index
+
+    def step_backward(self):
+        # Take back the previous event, solvers only place numbers into empty cells
+        self.position -= 1
+        index, num, action = self.trace.event(self.position)
+        self.cells[index] = num if action == STEP_UNDO else 0
+        self.last_index = index
+
+    def seek(self, target):
+        # Move to a step, starting from the nearest keyframe when that is shorter
+        target = max(0, min(len(self.trace), target))
+        keyframe = target // TRACE_KEYFRAME_INTERVAL
+        if target < self.position - TRACE_KEYFRAME_INTERVAL // 2 or target - self.position > target % TRACE_KEYFRAME_INTERVAL:
+            self.cells[:] = self.keyframes[keyframe]
+            self.position = keyframe * TRACE_KEYFRAME_INTERVAL
+            self.last_index = None
+        while self.position < target:
+            self.step_forward()
+        while self.position > target:
+            self.step_backward()
+
+    def to_board(self):
+        return [list(self.cells[row * 9:row * 9 + 9]) for row in range(9)]
+
+# Conflict tracking
+# Every cell belongs to one row unit (0-8), one column unit (9-17) and one box unit (18-26)
+CELL_UNITS = [(index // 9, 9 + index % 9, 18 + CELL_BOX[index]) for index in range(81)]
+
+class ConflictTracker:
+    """Per-unit digit counts updated one cell at a time, so board checks never rescan the grid"""
+    __slots__ = ("cells", "counts", "filled", "duplicates")
+
+    def __init__(self, board=None):
+        self.load(board)
+
+    def load(self, board):
+        # Recount from a whole nested 9x9 board
+        self.cells = [0] * 81
+        self.counts = [0] * 270
+        self.filled = 0
+        self.duplicates = 0
+        if board is not None:
+            for i in range(9):
+                for j in range(9):
+                    self.set(i, j, board[i][j])
+
+    def set(self, row, col, num):
+        # Update the counts for a cell changing to 'num' (0 to erase)
+        index = row * 9 + col
+        old = self.cells[index]
+        if old == num:
+            return
+        counts = self.counts
+        if old != 0:
+            self.filled -= 1
+            for unit in CELL_UNITS[index]:
+                counts[unit * 10 + old] -= 1
+                if counts[unit * 10 + old] == 1:
+                    self.duplicates -= 1
+        if num != 0:
+            self.filled += 1
+            for unit in CELL_UNITS[index]:
+                counts[unit * 10 + num] += 1
+                if counts[unit * 10 + num] == 2:
+                    self.duplicates += 1
+        self.cells[index] = num
+
+    def has_conflicts(self):
+        # Check if any row, column or box holds a number twice
+        return self.duplicates > 0
+
+    def is_solved(self):
+        # Check if the board is complete and conflict-free
+        return self.filled == 81 and self.duplicates == 0
+
+    def in_conflict(self, row, col):
+        # Check if the cell's number appears again in its row, column or box
+        index = row * 9 + col
+        num = self.cells[index]
+        if num == 0:
+            return False
+        counts = self.counts
+        return any(counts[unit * 10 + num] > 1 for unit in CELL_UNITS[index])
+
+# Dancing Links exact cover solver
+# 324 constraint columns: cell filled, digit in row, digit in column, digit in box
+# 729 candidate rows: candidate (row, col, num) has id (row * 9 + col) * 9 + num - 1
+DLX_COLUMNS = 324
+
+class DancingLinks:
+    """Algorithm X over a toroidal doubly linked exact cover matrix stored in flat lists"""
+
+    def __init__(self, board):
+        # Node 0 is the root, nodes 1-324 are the column headers
+        header_count = DLX_COLUMNS + 1
+        self.left = [i - 1 for i in range(header_count)]
+        self.right = [i + 1 for i in range(header_count)]
+        self.left[0] = DLX_COLUMNS
+        self.right[DLX_COLUMNS] = 0
+        self.up = list(range(header_count))
+        self.down = list(range(header_count))
+        self.column = list(range(header_count))
+        self.candidate = [-1] * header_count
+        self.size = [0] * header_count
+
+        # Add the 4 nodes of every candidate and remember the first one
+        first_node = []
+        for row in range(9):
+            for col in range(9):
+                box = (row // 3) * 3 + col // 3
+                for digit in range(9):
+                    first_node.append(self.add_candidate((row * 9 + col) * 9 + digit, (
+                        1 + row * 9 + col,
+                        82 + row * 9 + digit,
+                        163 + col * 9 + digit,
+                        244 + box * 9 + digit,
+                    )))
+
+        # Select the given numbers up front, a clash between givens leaves no solution
+        self.partial = []
+        self.consistent = True
+        for row in range(9):
+            for col in range(9):
+                num = board[row][col]
+                if num == 0:
+                    continue
+                node = first_node[(row * 9 + col) * 9 + num - 1]
+                if not self.is_column_active(self.column[node]) or not all(
+                        self.is_column_active(self.column[j]) for j in self.row_nodes(node)):
+                    self.consistent = False
+                    continue
+                self.select(node)
+
+        self.solution = None
+        self.solution_count = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        # Zero the work counters before a search
+        self.nodes = 0
+        self.guesses = 0  # Rows tried in columns that had more than one
+        self.checks = 0  # Columns covered
+        self.backtracks = 0
+        self.eliminations = 0  # Rows removed by covering the columns of a selected row
+        self.max_depth = 0
+
+    def stats(self):
+        # Snapshot of the work counters
+        return SolverStats(self.nodes, self.guesses, self.checks, self.backtracks,
+                           self.eliminations, self.max_depth)
+
+    def add_candidate(self, candidate, columns):
+        # Append one matrix row linked into the given columns
+        first = len(self.column)
+        for k, col in enumerate(columns):
+            node = first + k
+            self.left.append(first + (k - 1) % 4)
+            self.right.append(first + (k + 1) % 4)
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.column.append(col)
+            self.candidate.append(candidate)
+            self.size[col] += 1
+        return first
+
+    def row_nodes(self, node):
+        # The other nodes of the matrix row containing 'node'
+        j = self.right[node]
+        while j != node:
+            yield j
+            j = self.right[j]
+
+    def is_column_active(self, col):
+        # A covered column has been unlinked from the header list
+        return self.left[self.right[col]] == col
+
+    def cover(self, col):
+        # Remove the column and every row that satisfies it
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, col):
+        # Put the column and its rows back, in reverse order of cover
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def select(self, node):
+        # Add the row to the partial solution and cover all its columns
+        self.partial.append(self.candidate[node])
+        self.cover(self.column[node])
+        for j in self.row_nodes(node):
+            self.cover(self.column[j])
+
+    def solve(self, limit=1):
+        # Count solutions, stopping once 'limit' have been found (None counts them all)
+        self.solution = None
+        self.solution_count = 0
+        self.reset_stats()
+        if self.consistent:
+            self.search(limit)
+        return self.solution_count
+
+    def search(self, limit, depth=1):
+        right, down, size, column = self.right, self.down, self.size, self.column
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        # Every constraint is satisfied, record the solution
+        if right[0] == 0:
+            self.solution_count += 1
+            if self.solution is None:
+                self.solution = list(self.partial)
+            return
+
+        # Choose the column with the fewest remaining rows
+        col = right[0]
+        best = col
+        best_size = size[col]
+        while col != 0 and best_size > 1:
+            if size[col] < best_size:
+                best, best_size = col, size[col]
+            col = right[col]
+        col = best
+
+        if best_size == 0:
+            return
+
+        self.cover(col)
+        self.checks += 1
+        node = down[col]
+        while node != col:
+            self.nodes += 1
+            if best_size > 1:
+                self.guesses += 1
+            self.partial.append(self.candidate[node])
+            j = right[node]
+            covered = removed = 0
+            while j != node:
+                # A column holds exactly the rows its cover removes
+                removed += size[column[j]]
+                self.cover(column[j])
+                covered += 1
+                j = right[j]
+            self.checks += covered
+            self.eliminations += removed
+
+            found = self.solution_count
+            self.search(limit, depth + 1)
+
+            j = self.left[node]
+            while j != node:
+                self.uncover(column[j])
+                j = self.left[j]
+            self.partial.pop()
+
+            # Stop early once enough solutions have been counted
+            if limit is not None and self.solution_count >= limit:
+                break
+            if self.solution_count == found:
+                self.backtracks += 1
+            node = down[node]
+        self.uncover(col)
+
+    def solution_board(self):
+        # Convert the first solution found to a nested 9x9 board
+        board = [[0 for _ in range(9)] for _ in range(9)]
+        for candidate in self.solution or []:
+            cell, digit = divmod(candidate, 9)
+            board[cell // 9][cell % 9] = digit + 1
+        return board
+
+# Difficulty rating
+# Techniques in the order a human solver tries them, easiest first
+class Technique(Enum):
+    HIDDEN_SINGLE = {"name": "Hidden single", "level": 1, "weight": 1}
+    NAKED_SINGLE = {"name": "Naked single", "level": 2, "weight": 2}
+    POINTING = {"name": "Pointing", "level": 3, "weight": 5}
+    CLAIMING = {"name": "Claiming", "level": 3, "weight": 5}
+    NAKED_PAIR = {"name": "Naked pair", "level": 4, "weight": 10}
+    HIDDEN_PAIR = {"name": "Hidden pair", "level": 4, "weight": 12}
+    NAKED_TRIPLE = {"name": "Naked triple", "level": 5, "weight": 20}
+    X_WING = {"name": "X-wing", "level": 6, "weight": 40}
+    GUESS = {"name": "Guess", "level": 7, "weight": 100}
+
+ROW_UNITS = UNITS[:9]
+COL_UNITS = UNITS[9:18]
+BOX_UNITS = UNITS[18:]
+
+class Rating:
+    """Result of rating a puzzle: hardest technique needed, how often each was used and a score"""
+    __slots__ = ("hardest", "counts", "score")
+
+    def __init__(self, hardest, counts):
+        self.hardest = hardest
+        self.counts = counts
+        self.score = sum(technique.value["weight"] * count for technique, count in counts.items())
+
+    @property
+    def level(self):
+        return self.hardest.value["level"] if self.hardest else 0
+
+class DifficultyRater:
+    """Solves a puzzle with human techniques only, always applying the easiest one that makes progress"""
+
+    def rate(self, board):
+        # Rate a nested 9x9 board, GUESS is the hardest technique if logic alone gets stuck
+        self.cells = [0] * 81
+        self.candidates = [ALL_DIGITS] * 81
+        for i in range(9):
+            for j in range(9):
+                if board[i][j] != 0:
+                    self.place(i * 9 + j, board[i][j])
+        
+        steps = [
+            (Technique.HIDDEN_SINGLE, self.hidden_singles),
+            (Technique.NAKED_SINGLE, self.naked_singles),
+            (Technique.POINTING, self.pointing),
+            (Technique.CLAIMING, self.claiming),
+            (Technique.NAKED_PAIR, self.naked_pairs),
+            (Technique.HIDDEN_PAIR, self.hidden_pairs),
+            (Technique.NAKED_TRIPLE, self.naked_triples),
+            (Technique.X_WING, self.x_wings),
+        ]
+        counts = {}
+        hardest = None
+        while 0 in self.cells:
+            for technique, apply in steps:
+                used = apply()
+                if used:
+                    counts[technique] = counts.get(technique, 0) + used
+                    if hardest is None or technique.value["level"] > hardest.value["level"]:
+                        hardest = technique
+                    break
+            else:
+                # No technique makes progress, the rest needs guessing
+                counts[Technique.GUESS] = 1
+                hardest = Technique.GUESS
+                break
+        return Rating(hardest, counts)
+
+    def place(self, index, num):
+        # Fill the cell and remove the number from the candidates of its peers
+        bit = 1 << (num - 1)
+        self.cells[index] = num
+        self.candidates[index] = 0
+        candidates = self.candidates
+        for peer in CELL_PEERS[index]:
+            candidates[peer] &= ~bit
+
+    def eliminate(self, cells, mask):
+        # Remove the numbers in 'mask' from the cells, returns True if anything changed
+        candidates = self.candidates
+        changed = False
+        for index in cells:
+            if candidates[index] & mask:
+                candidates[index] &= ~mask
+                changed = True
+        return changed
+
+    def hidden_singles(self):
+        # A number with a single place left in a unit goes there
+        used = 0
+        cells, candidates = self.cells, self.candidates
+        for unit in UNITS:
+            once = twice = 0
+            for index in unit:
+                mask = candidates[index]
+                twice |= once & mask
+                once |= mask
+            hidden = once & ~twice
+            if hidden:
+                for index in unit:
+                    mask = candidates[index] & hidden
+                    if mask and cells[index] == 0:
+                        self.place(index, MASK_DIGITS[mask][0])
+                        used += 1
+        return used
+
+    def naked_singles(self):
+        # A cell with a single candidate left takes it
+        used = 0
+        cells, candidates = self.cells, self.candidates
+        for index in range(81):
+            mask = candidates[index]
+            if cells[index] == 0 and mask and mask & (mask - 1) == 0:
+                self.place(index, MASK_DIGITS[mask][0])
+                used += 1
+        return used
+
+    def locked_candidates(self, units, other_units, line_of):
+        # A number confined to one line inside a unit is removed from the rest of that line
+        used = 0
+        candidates = self.candidates
+        for unit in units:
+            for num in MASK_DIGITS[ALL_DIGITS]:
+                bit = 1 << (num - 1)
+                lines = {line_of(index) for index in unit if candidates[index] & bit}
+                if len(lines) != 1:
+                    continue
+                line = lines.pop()
+                if self.eliminate([index for index in other_units[line] if index not in unit], bit):
+                    used += 1
+        return used
+
+    def pointing(self):
+        # Box to row or column
+        return (self.locked_candidates(BOX_UNITS, ROW_UNITS, lambda index: index // 9) +
+                self.locked_candidates(BOX_UNITS, COL_UNITS, lambda index: index % 9))
+
+    def claiming(self):
+        # Row or column to box
+        return (self.locked_candidates(ROW_UNITS, BOX_UNITS, lambda index: CELL_BOX[index]) +
+                self.locked_candidates(COL_UNITS, BOX_UNITS, lambda index: CELL_BOX[index]))
+
+    def naked_subsets(self, size):
+        # 'size' cells of a unit sharing 'size' candidates take them from the rest of the unit
+        used = 0
+        candidates = self.candidates
+        for unit in UNITS:
+            open_cells = [index for index in unit if 2 <= len(MASK_DIGITS[candidates[index]]) <= size]
+            for group in combinations(open_cells, size):
+                mask = 0
+                for index in group:
+                    mask |= candidates[index]
+                if len(MASK_DIGITS[mask]) == size and self.eliminate(
+                        [index for index in unit if index not in group], mask):
+                    used += 1
+        return used
+
+    def naked_pairs(self):
+        return self.naked_subsets(2)
+
+    def naked_triples(self):
+        return self.naked_subsets(3)
+
+    def hidden_pairs(self):
+        # Two numbers that share the same two places in a unit rule out everything else there
+        used = 0
+        candidates = self.candidates
+        for unit in UNITS:
+            places = {}
+            for num in MASK_DIGITS[ALL_DIGITS]:
+                bit = 1 << (num - 1)
+                cells = tuple(index for index in unit if candidates[index] & bit)
+                if len(cells) == 2:
+                    places.setdefault(cells, []).append(bit)
+            for cells, bits in places.items():
+                if len(bits) == 2:
+                    keep = bits[0] | bits[1]
+                    if self.eliminate(cells, ALL_DIGITS & ~keep):
+                        used += 1
+        return used
+
+    def x_wings(self):
+        # A number in exactly the same two columns of two rows is removed from the rest of
+        # those columns, and the same with rows and columns swapped
+        used = 0
+        candidates = self.candidates
+        for lines, crossing, position in ((ROW_UNITS, COL_UNITS, lambda index: index % 9),
+                                          (COL_UNITS, ROW_UNITS, lambda index: index // 9)):
+            for num in MASK_DIGITS[ALL_DIGITS]:
+                bit = 1 << (num - 1)
+                pairs = {}
+                for line in lines:
+                    cells = [index for index in line if candidates[index] & bit]
+                    if len(cells) == 2:
+                        pairs.setdefault((position(cells[0]), position(cells[1])), []).append(line)
+                for (first, second), wing_lines in pairs.items():
+                    if len(wing_lines) < 2:
+                        continue
+                    wing = set(wing_lines[0]) | set(wing_lines[1])
+                    others = [index for index in crossing[first] + crossing[second] if index not in wing]
+                    if self.eliminate(others, bit):
+                        used += 1
+        return used
+
+# Flat boards
+# Byte translation tables between cell values 0-9 and the characters '0'-'9', '.' reads as
+# empty and any other character as 255 so it can be rejected
+DIGITS_FROM_TEXT = bytes(char - 48 if 48 <= char <= 57 else 0 if char == ord('.') else 255
+                         for char in range(256))
+DIGITS_TO_TEXT = bytes(48 + value if value < 10 else value for value in range(256))
+
+class FlatBoard:
+    """81 cells in one bytearray, row by row, 0 for empty. Converts boards to and from text in one pass"""
+    __slots__ = ("cells",)
+
+    def __init__(self, cells=None):
+        self.cells = bytearray(81) if cells is None else bytearray(cells)
+
+    @classmethod
+    def from_nested(cls, board):
+        # Flatten a nested 9x9 board
+        flat = cls.__new__(cls)
+        flat.cells = bytearray(chain.from_iterable(board))
+        return flat
+
+    @classmethod
+    def from_string(cls, text):
+        # Parse 81 characters, digits with 0 or '.' for empty cells
+        cells = bytearray(text, 'ascii').translate(DIGITS_FROM_TEXT)
+        if len(cells) != 81 or max(cells) > 9:
+            raise ValueError(f"not an 81-digit board: {text!r}")
+        board = cls.__new__(cls)
+        board.cells = cells
+        return board
+
+    def to_string(self):
+        # Serialize to 81 characters, 0 for empty cells
+        return self.cells.translate(DIGITS_TO_TEXT).decode('ascii')
+
+    def to_nested(self):
+        # Convert to a nested 9x9 board for the UI and the solvers
+        flat = list(self.cells)
+        return [flat[i:i + 9] for i in range(0, 81, 9)]
+
+def board_to_string(board):
+    # Serialize a nested 9x9 board to an 81-character string, 0 for empty cells
+    return FlatBoard.from_nested(board).to_string()
+
+def board_from_string(text):
+    # Parse an 81-character string back to a nested 9x9 board
+    return FlatBoard.from_string(text).to_nested()
+
+def check_entries(board, givens, solution):
+    # Compare the numbers entered on 'board' over the 'givens' with the known solution in one
+    # pass over the 81 cells. Returns the givens plus the correct entries, a consistent
+    # partial board to continue the search from, and the (row, col) cells entered wrong
+    start = [row[:] for row in givens]
+    wrong = []
+    for i in range(9):
+        for j in range(9):
+            num = board[i][j]
+            if num == 0 or givens[i][j] != 0:
+                continue
+            if num == solution[i][j]:
+                start[i][j] = num
+            else:
+                wrong.append((i, j))
+    return start, wrong
+
+# Solving algorithms by the names the game and the command line use
+ALGORITHMS = ("backtracking", "constraint", "dlx")
+
+def solve_board(board, algorithm="constraint"):
+    # Solve a nested 9x9 board with one of ALGORITHMS, returning the solved board,
+    # or None when the givens clash or there is no solution
+    return solve_with_stats(board, algorithm)[0]
+
+def solve_with_stats(board, algorithm="constraint", max_seconds=None):
+    # Solve like solve_board and also return the SolverStats of the search.
+    # 'max_seconds' bounds the backtracking search, which then returns None unfinished
+    conflicts = ConflictTracker()
+    conflicts.load(board)
+    if conflicts.has_conflicts():
+        return None, SolverStats()
+    
+    if algorithm == "backtracking":
+        solver = IterativeSolver(board)
+        solved = solver.run(max_seconds=max_seconds) == SolverStatus.SOLVED
+        return solver.to_board() if solved else None, solver.stats()
+    elif algorithm == "dlx":
+        dlx = DancingLinks(board)
+        solved = dlx.solve()
+        return dlx.solution_board() if solved else None, dlx.stats()
+    else:  # constraint propagation
+        solver = PropagationSolver(board)
+        solved = solver.solve()
+        return solver.solution.to_board() if solved else None, solver.stats()
+
+# Symmetry transforms
+class GridTransform:
+    """Validity-preserving transform: optional transpose, row and column permutations, digit relabeling"""
+    __slots__ = ("cells", "digits")
+
+    def __init__(self, cells, digits):
+        # New cell i takes the number of old cell cells[i], relabeled through digits
+        self.cells = cells
+        self.digits = digits
+
+    @classmethod
+    def from_parts(cls, rows, cols, transpose, digits):
+        # Build the transform from a row order, a column order, the transpose flag and a digit map
+        if transpose:
+            cells = [cols[c] * 9 + rows[r] for r in range(9) for c in range(9)]
+        else:
+            cells = [rows[r] * 9 + cols[c] for r in range(9) for c in range(9)]
+        return cls(cells, digits)
+
+    @classmethod
+    def random(cls):
+        # Pick a random transform: bands and the rows inside each band are shuffled
+        # independently, the same for stacks and columns
+        def shuffled_lines():
+            blocks = random.sample(range(3), 3)
+            return [block * 3 + line for block in blocks for line in random.sample(range(3), 3)]
+        
+        digits = [0] + random.sample(range(1, 10), 9)
+        return cls.from_parts(shuffled_lines(), shuffled_lines(), random.random() < 0.5, digits)
+
+    def apply(self, board):
+        # Transform a nested 9x9 board, empty cells stay empty
+        flat = [num for row in board for num in row]
+        digits, cells = self.digits, self.cells
+        return [[digits[flat[cells[i * 9 + j]]] for j in range(9)] for i in range(9)]
+
+    def inverse(self):
+        # The transform that undoes this one
+        cells = [0] * 81
+        for new, old in enumerate(self.cells):
+            cells[old] = new
+        digits = [0] * 10
+        for old, new in enumerate(self.digits):
+            digits[new] = old
+        return GridTransform(cells, digits)
+
+# Canonical form
+# Empty cells sort after every digit, so the canonical form starts with its densest rows,
+# which leaves fewer ties to carry along than starting with the emptiest ones
+CANONICAL_EMPTY = 10
+STACK_ORDERS = list(permutations(range(3)))
+# Very dense or very regular boards tie in thousands of partial transforms, past this many
+# the search costs far more than solving the board does
+CANONICAL_MAX_STATES = 128
+
+def canonicalize(board, max_states=CANONICAL_MAX_STATES):
+    # Find the smallest variant of a board under the symmetry group: transpose, band and
+    # stack order, row order within each band, column order within each stack and digit
+    # relabeling. Digits are relabeled in order of first appearance and the variants are
+    # compared row by row, keeping every partial transform that ties for the smallest rows
+    # so far. Columns that held the same values in every row so far stay in one group
+    # whose order is still open. Returns the canonical 81-character string and the
+    # GridTransform that maps the board onto it, or None when more than 'max_states'
+    # partial transforms tie. The board must not hold a digit twice in a row, column or box
+    flat = [num for row in board for num in row]
+    flipped = [flat[c * 9 + r] for r in range(9) for c in range(9)]
+
+    # A state is (transpose, grid, rows taken, column groups, digit labels, labels used)
+    states = []
+    for transpose, grid in ((False, flat), (True, flipped)):
+        for stacks in STACK_ORDERS:
+            groups = tuple((stack * 3, stack * 3 + 1, stack * 3 + 2) for stack in stacks)
+            states.append((transpose, grid, (), groups, (0,) * 10, 0))
+
+    canonical = []
+    for _ in range(9):
+        # The smallest next row over every state and every row it may take next
+        best = None
+        ties = []
+        for state in states:
+            for row in next_canonical_rows(state[2]):
+                key = canonical_row_key(state, row)
+                if best is None or key < best:
+                    best, ties = key, [(state, row)]
+                elif key == best:
+                    ties.append((state, row))
+        canonical.extend(best)
+
+        # Take the row in every tied state. States that took the same rows in another order
+        # and ended up with the same groups and labels go on the same way, one is kept
+        kept = {}
+        for state, row in ties:
+            for new in refine_canonical_state(state, row):
+                kept[(new[0], frozenset(new[2])) + new[3:]] = new
+            if len(kept) > max_states:
+                return None
+        states = list(kept.values())
+
+    # Any remaining state gives the same grid, digits the board lacks get the free labels
+    transpose, _, rows, groups, labels, used = states[0]
+    digits = list(labels)
+    free = iter(range(used + 1, 10))
+    for num in range(1, 10):
+        if not digits[num]:
+            digits[num] = next(free)
+    transform = GridTransform.from_parts(rows, [col for group in groups for col in group], transpose, digits)
+    return ''.join(str(0 if key == CANONICAL_EMPTY else key) for key in canonical), transform
+
+def next_canonical_rows(rows):
+    # Rows a partial transform may take next: any row of a band it has not used
+    # when starting a band, else the rest of the current band
+    if len(rows) % 3 == 0:
+        used = {row // 3 for row in rows}
+        return [row for row in range(9) if row // 3 not in used]
+    band = rows[-1] // 3
+    return [row for row in range(band * 3, band * 3 + 3) if row not in rows]
+
+def canonical_row_key(state, row):
+    # The smallest the row can read with the state's labels, each column group ordered
+    # with its labeled digits first, then new digits taking the next labels, then empty cells
+    _, grid, _, groups, labels, used = state
+    key = []
+    base = row * 9
+    for group in groups:
+        labeled = []
+        new = empty = 0
+        for col in group:
+            num = grid[base + col]
+            if num == 0:
+                empty += 1
+            elif labels[num]:
+                labeled.append(labels[num])
+            else:
+                new += 1
+        labeled.sort()
+        key.extend(labeled)
+        key.extend(range(used + 1, used + new + 1))
+        used += new
+        key.extend([CANONICAL_EMPTY] * empty)
+    return tuple(key)
+
+def refine_canonical_state(state, row):
+    # The states after taking the row: each group splits into its labeled digits in label
+    # order, its new digits in every order (each order labels them differently) and one
+    # group of its empty cells
+    transpose, grid, rows, groups, labels, used = state
+    base = row * 9
+    partials = [((), labels, used)]
+    for group in groups:
+        labeled = sorted((labels[grid[base + col]], col) for col in group
+                         if grid[base + col] and labels[grid[base + col]])
+        new = [col for col in group if grid[base + col] and not labels[grid[base + col]]]
+        empty = tuple(col for col in group if not grid[base + col])
+        head = tuple((col,) for _, col in labeled)
+        tail = (empty,) if empty else ()
+
+        expanded = []
+        for done, partial_labels, partial_used in partials:
+            for order in permutations(new) if len(new) > 1 else (new,):
+                next_labels = list(partial_labels)
+                for position, col in enumerate(order, partial_used + 1):
+                    next_labels[grid[base + col]] = position
+                expanded.append((done + head + tuple((col,) for col in order) + tail,
+                                 tuple(next_labels), partial_used + len(order)))
+        partials = expanded
+    return [(transpose, grid, rows + (row,), done, partial_labels, partial_used)
+            for done, partial_labels, partial_used in partials]
+
+class PuzzleGenerator:
+    """Generates puzzles with a unique solution, keeps its own working board so it can run off the UI thread"""
+
+    def __init__(self, mode=None, seed_path=SEED_FILE):
+        self.board = [[0 for _ in range(9)] for _ in range(9)]
+        self.mode = mode or GenerationMode.SEARCH
+        self.rater = DifficultyRater()
+        self.seeds = self.load_seeds(seed_path)
+
+    def load_seeds(self, path):
+        # Load the bank of known-good puzzles and solutions per difficulty
+        try:
+            with open(path, 'r') as f:
+                return {name: [tuple(seed) for seed in seeds] for name, seeds in json.load(f).items()}
+        except:
+            return {}
+
+    def generate(self, difficulty):
+        # Generate a puzzle and its solution with the current generation mode
+        if self.mode == GenerationMode.TRANSFORM and self.seeds.get(difficulty.name):
+            return self.generate_from_seed(difficulty)
+        return self.generate_by_search(difficulty)
+
+    def generate_from_seed(self, difficulty):
+        # Transform a random seed puzzle, which keeps its unique solution and its difficulty
+        puzzle, solved_board = random.choice(self.seeds[difficulty.name])
+        transform = GridTransform.random()
+        return transform.apply(board_from_string(puzzle)), transform.apply(board_from_string(solved_board))
+
+    def generate_by_search(self, difficulty):
+        # Carve puzzles until one rates inside the difficulty's technique levels,
+        # settling for the closest one if none does within the attempts
+        empty_cells = difficulty.value["empty_cells"]
+        low, high = difficulty.value["levels"]
+        best = None
+        for _ in range(GENERATE_ATTEMPTS):
+            # Reset the board
+            self.board = [[0 for _ in range(9)] for _ in range(9)]
+            
+            # Generate a solved board
+            self.solve_empty_board()
+            solved_board = [row[:] for row in self.board]
+            
+            # Remove cells based on difficulty
+            cells = [(i, j) for i in range(9) for j in range(9)]
+            random.shuffle(cells)
+            removed = self.remove_cells(empty_cells, cells)
+            rating = self.rater.rate(self.board)
+            
+            # Keep removing cells while the puzzle rates too easy
+            while rating.level < low and self.remove_cells(1, cells):
+                removed += 1
+                rating = self.rater.rate(self.board)
+            
+            miss = max(low - rating.level, rating.level - high, 0) * 81 + max(empty_cells - removed, 0)
+            if best is None or miss < best[0]:
+                best = (miss, solved_board, self.board)
+            if miss == 0:
+                break
+        
+        # Return the puzzle and its solution
+        _, solved_board, puzzle = best
+        return puzzle, solved_board
+    
+    def solve_empty_board(self):
+        # Fill the diagonal boxes first (these can be filled independently)
+        for i in range(0, 9, 3):
+            self.fill_box(i, i)
+        
+        # Solve the rest of the board
+        self.solve_board()
+    
+    def fill_box(self, row, col):
+        # Fill a 3x3 box with random numbers
+        nums = list(range(1, 10))
+        random.shuffle(nums)
+        
+        index = 0
+        for i in range(3):
+            for j in range(3):
+                self.board[row + i][col + j] = nums[index]
+                index += 1
+    
+    def solve_board(self):
+        # Solve the board using randomized backtracking on the bitmask engine
+        engine = BitBoard(self.board)
+        if not engine.solve(shuffle=True):
+            return False
+
+        engine.write_to(self.board)
+        return True
+    
+    def remove_cells(self, count, cells):
+        # Remove up to 'count' cells from the board, keeping only the removals
+        # after which the puzzle still has exactly one solution. Cells are tried
+        # in the order given and taken off the list, so later calls continue there
+        removed = 0
+        while cells and removed < count:
+            i, j = cells.pop()
+            num = self.board[i][j]
+            self.board[i][j] = 0
+            if CandidateGrid(self.board).count_solutions(2) == 1:
+                removed += 1
+            else:
+                self.board[i][j] = num
+        return removed
+
+class PuzzlePool:
+    """Ready puzzles per difficulty, refilled by a background thread and kept on disk between runs"""
+
+    def __init__(self, generator, path=POOL_FILE, size=POOL_SIZE):
+        self.generator = generator
+        self.path = path
+        self.size = size
+        self.puzzles = {difficulty.name: deque() for difficulty in Difficulty}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.dirty = False
+        self.stopped = False
+        self.thread = None
+        self.load()
+
+    def load(self):
+        # Load the puzzles left over from the previous run
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    saved_pool = json.load(f)
+                for name, puzzles in saved_pool.items():
+                    if name in self.puzzles:
+                        self.puzzles[name].extend(tuple(puzzle) for puzzle in puzzles[:self.size])
+        except:
+            pass
+
+    def save(self):
+        # Save the ready puzzles so the next run starts with a full pool
+        with self.lock:
+            saved_pool = {name: list(puzzles) for name, puzzles in self.puzzles.items()}
+            self.dirty = False
+            with open(self.path, 'w') as f:
+                json.dump(saved_pool, f)
+
+    def start(self):
+        # Start the background refill thread
+        self.thread = threading.Thread(target=self.refill, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        # Stop the refill thread and save what is in the pool, a puzzle still being
+        # generated is dropped so the pool file is not written again after this
+        self.stopped = True
+        self.wakeup.set()
+        self.save()
+
+    def set_mode(self, mode):
+        # Switch the generation mode, dropping the ready puzzles made the old way
+        with self.lock:
+            self.generator.mode = mode
+            for puzzles in self.puzzles.values():
+                puzzles.clear()
+        self.save()
+        self.wakeup.set()
+
+    def pop(self, difficulty):
+        # Take a puzzle and its solution out of the pool, None if the pool is empty
+        with self.lock:
+            puzzles = self.puzzles[difficulty.name]
+            puzzle = puzzles.popleft() if puzzles else None
+            self.dirty = True
+        self.wakeup.set()
+        if puzzle is None:
+            return None
+        return board_from_string(puzzle[0]), board_from_string(puzzle[1])
+
+    def most_needed(self):
+        # The difficulty with the fewest ready puzzles, None when all pools are full
+        with self.lock:
+            name = min(self.puzzles, key=lambda name: len(self.puzzles[name]))
+            if len(self.puzzles[name]) >= self.size:
+                return None
+            return Difficulty[name]
+
+    def refill(self):
+        # Generate puzzles until every pool is full, then sleep until one is popped
+        while not self.stopped:
+            difficulty = self.most_needed()
+            if difficulty is None:
+                if self.dirty and not self.stopped:
+                    self.save()
+                self.wakeup.wait()
+                self.wakeup.clear()
+                
+                # Give the UI thread time to finish what triggered the refill
+                time.sleep(POOL_REFILL_DELAY)
+                continue
+            
+            mode = self.generator.mode
+            puzzle, solved_board = self.generator.generate(difficulty)
+            if self.stopped:
+                return
+            with self.lock:
+                # A puzzle made before the mode changed is not kept
+                if self.generator.mode != mode:
+                    continue
+                self.puzzles[difficulty.name].append((board_to_string(puzzle), board_to_string(solved_board)))
+                self.dirty = True
+
+# Solutions are cached by canonical puzzle, so a puzzle seen before in any symmetric form
+# is answered without a search. Older entries are dropped once the cache is full
+SOLUTION_CACHE_FILE = 'data/solution_cache.json'
+SOLUTION_CACHE_SIZE = 10000
+
+class SolutionCache:
+    """Least recently used solutions by canonical puzzle, kept on disk between runs"""
+
+    def __init__(self, path=SOLUTION_CACHE_FILE, size=SOLUTION_CACHE_SIZE):
+        self.path = path
+        self.size = size
+        self.solutions = OrderedDict()  # Canonical puzzle -> its solution, least recently used first
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        # Load the entries saved by the previous run, keeping the most recently used
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    entries = json.load(f)
+                for puzzle, solution in entries[-self.size:]:
+                    self.solutions[puzzle] = solution
+        except:
+            pass
+
+    def save(self):
+        # Save the entries, least recently used first
+        with open(self.path, 'w') as f:
+            json.dump(list(self.solutions.items()), f)
+        self.dirty = False
+
+    def get(self, puzzle):
+        # The solution of a canonical puzzle, None when it is not cached
+        solution = self.solutions.get(puzzle)
+        if solution is not None:
+            self.solutions.move_to_end(puzzle)
+        return solution
+
+    def put(self, puzzle, solution):
+        # Cache the solution of a canonical puzzle, dropping the least recently used entry when full
+        self.solutions[puzzle] = solution
+        self.solutions.move_to_end(puzzle)
+        if len(self.solutions) > self.size:
+            self.solutions.popitem(last=False)
+        self.dirty = True
+
+    def solve(self, board, algorithm="constraint"):
+        # Solve like solve_board, a cache hit is a lookup and the inverse transform of the
+        # cached solution. Returns the solution and the (canonical puzzle, canonical solution)
+        # entry that answered or now holds it, None for an unsolvable puzzle.
+        # Clashing givens have no solution and no canonical form
+        conflicts = ConflictTracker(board)
+        if conflicts.has_conflicts():
+            self.misses += 1
+            return None, None
+
+        # A board too symmetric to canonicalize quickly is solved directly and not cached
+        canonical = canonicalize(board)
+        if canonical is None:
+            self.misses += 1
+            return solve_board(board, algorithm), None
+        
+        puzzle, transform = canonical
+        solution = self.get(puzzle)
+        if solution is not None:
+            self.hits += 1
+            return transform.inverse().apply(board_from_string(solution)), (puzzle, solution)
+        
+        self.misses += 1
+        solved_board = solve_board(board, algorithm)
+        if solved_board is None:
+            return None, None
+        solution = board_to_string(transform.apply(solved_board))
+        self.put(puzzle, solution)
+        return solved_board, (puzzle, solution)
@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sudoku_core import (
+    ConflictTracker, GridTransform, SolutionCache,
+    board_from_string, canonicalize, solve_board
+)
+
+PUZZLE = "400000805030000000000700000020000060000080400000010000000603070500200000104000000"
+
+def test_symmetric_variants_share_a_canonical_form():
+    board = board_from_string(PUZZLE)
+    puzzle, transform = canonicalize(board)
+    assert board_from_string(puzzle) == transform.apply(board)
+    for _ in range(5):
+        assert canonicalize(GridTransform.random().apply(board))[0] == puzzle
+
+def test_one_full_row_is_solved_without_canonical_search(tmp_path):
+    # Every column order of the full row ties, which once took seconds per board
+    board = [list(range(1, 10))] + [[0] * 9 for _ in range(8)]
+    assert canonicalize(board) is None
+
+    cache = SolutionCache(str(tmp_path / "cache.json"))
+    start = time.perf_counter()
+    solution, entry = cache.solve(board)
+    assert time.perf_counter() - start < 1
+    assert entry is None
+    assert solution[0] == board[0]
+    conflicts = ConflictTracker(solution)
+    assert conflicts.is_solved()
+
+def test_cached_solution_answers_a_variant(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.json"))
+    board = board_from_string(PUZZLE)
+    solution, entry = cache.solve(board)
+    assert entry is not None and solution == solve_board(board)
+
+    variant = GridTransform.random().apply(board)
+    solution, _ = cache.solve(variant)
+    assert cache.hits == 1
+    assert solution == solve_board(variant)